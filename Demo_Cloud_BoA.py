@@ -27,14 +27,18 @@ def Demo():
     Network = CreateNetworkExample(ex=2)
     Domain = CloudServices(Network=Network,gap_alpha=2)
 
-    # Set Method
+    # Set Method (tracking all Lyapunov exponents; Modes=k tracks only the
+    # k leading ones, which larger markets call for, and makes them the
+    # signature MCT classifies starts by)
     eps = 1e-2
-    Method = HeunEuler_LEGS(Domain=Domain,P=BoxProjection(lo=eps),Delta0=1e0)
+    Modes = None
+    Method = HeunEuler_LEGS(Domain=Domain,P=BoxProjection(lo=eps),Delta0=1e0,
+                            Modes=Modes)
 
     # Set Options
     Init = Initialization(Step=-1e-3)
     Term = Termination(MaxIter=1e5)
-    Repo = Reporting(Requests=['Data','Step'])
+    Repo = Reporting(Requests=['Data','Step'],Columnar=True)
     Misc = Miscellaneous()
     Options = DescentOptions(Init,Term,Repo,Misc)
     args = (Method,Domain,Options)
@@ -52,7 +56,7 @@ def Demo():
     # Compute results
     results = MCT(sim,args,grid,nodes=16,limit=40,AVG=0.00,
                   eta_1=1.2,eta_2=.95,eps=1.,
-                  L=16,q=8,r=1.1,Dinv=Dinv)
+                  L=16,q=8,r=1.1,Dinv=Dinv,Modes=Modes)
     ref, data, p, iters, avg, bndry_ids, starts = results
 
     # Save results
@@ -29,7 +29,7 @@ def Demo():
     # Set Options
     Init = Initialization(Step=1e-5)
     Term = Termination(MaxIter=5e4)
-    Repo = Reporting(Requests=['Data','Step'])
+    Repo = Reporting(Requests=['Data','Step'],Columnar=True)
     Misc = Miscellaneous()
     Options = DescentOptions(Init,Term,Repo,Misc)
     args = (Method,Domain,Options)
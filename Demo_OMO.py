@@ -153,7 +153,8 @@ def infinity_loss(Domain,Start):
     # Set Options
     Init = Initialization(Step=-1e-10)
     Term = Termination(MaxIter=25000,Tols=[(Domain.gap_rplus,1e-6*gap_0)])
-    Repo = Reporting(Requests=[Domain.gap_rplus,'Data',Domain.F])
+    Repo = Reporting(Requests=[Domain.gap_rplus,'Data',Domain.F],
+                     Columnar=True)
     Misc = Miscellaneous()
     Options = DescentOptions(Init,Term,Repo,Misc)
 
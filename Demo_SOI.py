@@ -6,6 +6,7 @@ from VISolver.Domains.SOI import SOI, CreateRandomNetwork
 from VISolver.Solvers.CashKarp import CashKarp
 
 from VISolver.Projection import BoxProjection
+from VISolver.StepControl import PIControl
 from VISolver.Solver import Solve
 from VISolver.Options import (
     DescentOptions, Miscellaneous, Reporting, Termination, Initialization)
@@ -19,9 +20,11 @@ def Demo():
     # Define Network and Domain
     Network = CreateRandomNetwork(m=3,n=2,o=2,seed=0)
     Domain = SOI(Network=Network,alpha=2)
+    Domain.CacheF()
 
     # Set Method
-    Method = CashKarp(Domain=Domain,P=BoxProjection(lo=0),Delta0=1e-5)
+    Method = CashKarp(Domain=Domain,P=BoxProjection(lo=0),
+                      Control=PIControl(Abs=1e-5,Rel=1e-3))
 
     # Initialize Starting Point
     Start = np.zeros(Domain.Dim)
@@ -33,7 +36,7 @@ def Demo():
     Init = Initialization(Step=-1e-10)
     Term = Termination(MaxIter=25000,Tols=[(Domain.gap_rplus,1e-6*gap_0)])
     Repo = Reporting(Requests=[Domain.gap_rplus, 'Step', 'F Evaluations',
-                               'Projections','Data'])
+                               'Projections','Rejected Steps','Data'])
     Misc = Miscellaneous()
     Options = DescentOptions(Init,Term,Repo,Misc)
 
@@ -7,6 +7,7 @@ from VISolver.Domains.SupplyChain import (
 from VISolver.Solvers.CashKarp import CashKarp
 
 from VISolver.Projection import BoxProjection
+from VISolver.StepControl import PIControl
 from VISolver.Solver import Solve
 from VISolver.Options import (
     DescentOptions, Miscellaneous, Reporting, Termination, Initialization)
@@ -22,7 +23,8 @@ def Demo():
     Domain = SupplyChain(Network=Network,alpha=2)
 
     # Set Method
-    Method = CashKarp(Domain=Domain,P=BoxProjection(lo=0),Delta0=1e-5)
+    Method = CashKarp(Domain=Domain,P=BoxProjection(lo=0),
+                      Control=PIControl(Abs=1e-5,Rel=1e-3))
 
     # Initialize Starting Point
     x = 10*np.ones(np.product(Domain.x_shape))
@@ -37,7 +39,7 @@ def Demo():
     Init = Initialization(Step=-1e-10)
     Term = Termination(MaxIter=25000,Tols=[(Domain.gap_rplus,1e-3*gap_0)])
     Repo = Reporting(Requests=[Domain.gap_rplus, 'Step', 'F Evaluations',
-                               'Projections','Data'])
+                               'Projections','Rejected Steps','Data'])
     Misc = Miscellaneous()
     Options = DescentOptions(Init,Term,Repo,Misc)
 
@@ -12,6 +12,8 @@ from VISolver.Options import (
     DescentOptions, Miscellaneous, Reporting, Termination, Initialization)
 from VISolver.Log import PrintSimResults, PrintSimStats
 
+import matplotlib as mpl
+mpl.use("Agg")
 import matplotlib.animation as animation
 import matplotlib.cm as cm
 import matplotlib.pyplot as plt
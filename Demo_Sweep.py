@@ -0,0 +1,50 @@
+import numpy as np
+
+from VISolver.Domains.Watson import Watson
+
+from VISolver.Solvers.Euler import Euler
+from VISolver.Solvers.HeunEuler import HeunEuler
+
+from VISolver.Projection import EntropicProjection
+from VISolver.Options import (
+    DescentOptions, Miscellaneous, Reporting, Termination, Initialization)
+from VISolver.Sweep import Sweep
+
+
+def WatsonOptions(Domain,MaxIter=1000):
+    Init = Initialization(Step=-1e-1)
+    Term = Termination(MaxIter=MaxIter,Tols=[[Domain.gap_simplex,1e-3]])
+    Repo = Reporting(Requests=[Domain.gap_simplex])
+    Misc = Miscellaneous()
+    return DescentOptions(Init,Term,Repo,Misc)
+
+
+def Demo():
+
+    #__WATSON_TRIALS__##################################################
+
+    # Define Domains
+    Domains = [('Watson',Watson,{'Pos': range(10)})]
+
+    # Set Methods
+    P = {'Entropic': EntropicProjection()}
+    Methods = [('Euler',Euler,{'P': P}),
+               ('HeunEuler',HeunEuler,{'P': P, 'Delta0': [1e-1,1e-2]})]
+
+    # Set Options
+    Options = [('Watson',WatsonOptions,{'MaxIter': [1000]})]
+
+    # Initialize Starting Point
+    Start = lambda Domain: np.ones(Domain.Dim)/np.double(Domain.Dim)
+
+    # Run Sweep (rerunning skips configurations already in the table)
+    Table = Sweep(Domains,Methods,Options,'Watson_Sweep.npz',Start=Start,
+                  Timeout=60)
+
+    # Print Results
+    for key, gap, steps in zip(Table['Key'],Table['gap_simplex'],
+                               Table['Iterations']):
+        print('%s: gap %g after %d steps' % (key,gap,steps))
+
+if __name__ == '__main__':
+    Demo()
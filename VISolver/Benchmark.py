@@ -0,0 +1,274 @@
+'''Benchmarks every solver in VISolver.Solvers against representative domains.
+
+Each solver is run on each case in its own process (see VISolver.Sweep) and
+timed; the results can be saved as a JSON baseline and compared against an
+earlier one:
+
+    python -m VISolver.Benchmark --save new.json --baseline old.json
+
+--quick runs smaller instances of the large domains.
+'''
+from __future__ import print_function
+import argparse
+import functools
+import importlib
+import json
+import os
+import pkgutil
+import platform
+import resource
+import tempfile
+
+import numpy as np
+
+import VISolver.Solvers
+from VISolver.Projection import (
+    BoxProjection, EntropicProjection, IdentityProjection)
+from VISolver.Options import (
+    DescentOptions, Miscellaneous, Reporting, Termination, Initialization)
+from VISolver.Solver import Solver
+from VISolver.Sweep import Sweep, LoadTable, Rows
+
+
+class Case(object):
+    '''One benchmark domain and the settings every solver is run with.
+
+    Domain builds the domain and Start its starting point. Runs stop once
+    the gap function named Gap falls below Tol times its starting value, or
+    after MaxIter iterations.
+    '''
+
+    def __init__(self,Name,Domain,P,Start,Gap,Tol,Step,MaxIter,Jac=False):
+        self.Name = Name
+        self.Domain = Domain
+        self.P = P
+        self.Start = Start
+        self.Gap = Gap
+        self.Tol = Tol
+        self.Step = Step
+        self.MaxIter = MaxIter
+        self.Jac = Jac
+
+    def Options(self,Domain):
+        Gap = getattr(Domain,self.Gap)
+        gap_0 = Gap(self.Start(Domain))
+        Init = Initialization(Step=self.Step)
+        Term = Termination(MaxIter=self.MaxIter,Tols=[(Gap,self.Tol*gap_0)])
+        Repo = Reporting(Requests=[Gap])
+        Misc = Miscellaneous()
+        return DescentOptions(Init,Term,Repo,Misc)
+
+
+def Seeded(Factory,seed=0):
+    # Domains drawing random data are built from a fixed seed
+    def Build():
+        np.random.seed(seed)
+        return Factory()
+    return Build
+
+
+def Simplex(Domain):
+    return np.ones(Domain.Dim)/np.double(Domain.Dim)
+
+
+def SupplyChainStart(Domain):
+    x = 10*np.ones(np.product(Domain.x_shape))
+    gam = np.ones(np.sum([np.product(g) for g in Domain.gam_shapes]))
+    lam = np.zeros(np.sum([np.product(l) for l in Domain.lam_shapes]))
+    return np.concatenate((x,gam,lam))
+
+
+def Cases(Quick=False):
+    from VISolver.Domains.Sun import Sun
+    from VISolver.Domains.RG import RG
+    from VISolver.Domains.MHPH import MHPH
+    from VISolver.Domains.Watson import Watson
+    from VISolver.Domains.KojimaShindo import KojimaShindo
+    from VISolver.Domains import SOI, SupplyChain, BloodBank, CloudServices
+    from VISolver.Domains.Lienard import Lienard
+
+    Large = 1000 if Quick else 8000
+    Medium = 200 if Quick else 1000
+    MaxIter = 1000 if Quick else 25000
+    Zeros = lambda Domain: np.zeros(Domain.Dim)
+    Ones = lambda Domain: np.ones(Domain.Dim)
+
+    return [
+        Case('Sun(%d)' % Large,lambda: Sun(Dim=Large),EntropicProjection(),
+             Simplex,'gap_simplex',1e-3,-1e-1,1000),
+        Case('RG(%d)' % Medium,Seeded(lambda: RG(Dim=Medium)),
+             EntropicProjection(),Simplex,'gap_simplex',1e-3,-1e-1,1000),
+        Case('MHPH(%d)' % Medium,Seeded(lambda: MHPH(Dim=Medium)),
+             EntropicProjection(),Simplex,'gap_simplex',1e-3,-1e-1,1000),
+        Case('Watson',lambda: Watson(Pos=0),EntropicProjection(),Simplex,
+             'gap_simplex',1e-3,-1e-1,1000),
+        Case('KojimaShindo',KojimaShindo,EntropicProjection(),Simplex,
+             'gap_simplex',1e-3,-1e-1,1000),
+        Case('SOI',lambda: SOI.SOI(
+             Network=SOI.CreateRandomNetwork(m=3,n=2,o=2,seed=0),alpha=2),
+             BoxProjection(lo=0),Zeros,'gap_rplus',1e-6,-1e-10,MaxIter),
+        Case('SupplyChain',lambda: SupplyChain.SupplyChain(
+             Network=SupplyChain.CreateRandomNetwork(I=2,Nm=2,Nd=2,Nr=1,
+                                                     seed=0),alpha=2),
+             BoxProjection(lo=0),SupplyChainStart,'gap_rplus',1e-3,-1e-10,
+             MaxIter),
+        Case('BloodBank',lambda: BloodBank.BloodBank(
+             Network=BloodBank.CreateRandomNetwork(nC=2,nB=2,nD=2,nR=2,
+                                                   seed=0),alpha=2),
+             BoxProjection(lo=0),Zeros,'gap_rplus',1e-6,-1e-10,MaxIter),
+        Case('CloudServices',lambda: CloudServices.CloudServices(
+             Network=CloudServices.CreateNetworkExample(ex=1),gap_alpha=2),
+             BoxProjection(lo=1e-2),Ones,'gap_rplus',1e-12,-1e-3,
+             MaxIter//25,Jac=True),
+        Case('Lienard',Lienard,IdentityProjection(),
+             lambda Domain: np.array([-.1,1.0]),'gap',1e-3,1e-3,
+             MaxIter//25,Jac=True),
+    ]
+
+
+def Solvers():
+    '''Every solver class defined in the modules of VISolver.Solvers.'''
+    Classes = []
+    for _, name, _ in pkgutil.iter_modules(VISolver.Solvers.__path__):
+        Module = importlib.import_module('VISolver.Solvers.'+name)
+        for obj in vars(Module).values():
+            if isinstance(obj,type) and issubclass(obj,Solver) and \
+                    obj.__module__ == Module.__name__:
+                Classes.append(obj)
+    return sorted(Classes,key=lambda cls: cls.__name__)
+
+
+def PeakMemory(Record,Domain):
+    # Peak resident set size of the worker process in MB
+    Peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    if platform.system() == 'Darwin':
+        return Peak/2.**20
+    return Peak/2.**10
+
+
+def Run(Cases,Solvers,Timeout=600,Verbose=True):
+    '''Runs every solver on every case, one at a time, and returns a dict
+    mapping 'Case/Solver' to its metrics.'''
+    fd, Path = tempfile.mkstemp(suffix='.npz')
+    os.close(fd)
+    os.remove(Path)
+    try:
+        for case in Cases:
+            # Lyapunov exponent solvers need the domain's Jacobian and some
+            # solvers a Euclidean projection
+            Methods = [(cls.__name__,functools.partial(cls,P=case.P),{})
+                       for cls in Solvers
+                       if (case.Jac or not cls.__name__.endswith('_LEGS')) and
+                       (case.P.Euclidean or not cls.Euclidean)]
+            Sweep([(case.Name,case.Domain,{})],Methods,
+                  [('Benchmark',case.Options,{})],Path,Start=case.Start,
+                  Metrics={'Peak Memory': PeakMemory},Nodes=1,
+                  Timeout=Timeout,Verbose=Verbose)
+        Table = Rows(LoadTable(Path))
+    finally:
+        if os.path.exists(Path):
+            os.remove(Path)
+
+    Gaps = dict((case.Name,case.Gap) for case in Cases)
+    Results = {}
+    for Row in Table:
+        Result = {'Status': Row['Status'], 'Time': Row.get('Time'),
+                  'Iterations': Row.get('Iterations'),
+                  'Peak Memory': Row.get('Peak Memory'),
+                  'F Evaluations/s': None, 'Iterations to Tol': None}
+        if 'F Evaluations' in Row and Row['Time'] > 0:
+            Result['F Evaluations/s'] = Row['F Evaluations']/Row['Time']
+        if Row.get('TerminatedBy') == Gaps[Row['Domain']]:
+            Result['Iterations to Tol'] = Row['Iterations']
+        Results[Row['Domain']+'/'+Row['Method']] = Result
+    return Results
+
+
+def Save(Results,Path,Quick=False):
+    Baseline = {'Quick': Quick, 'Python': platform.python_version(),
+                'NumPy': np.__version__, 'Results': Results}
+    with open(Path,'w') as File:
+        json.dump(Baseline,File,indent=1,sort_keys=True)
+
+
+def Load(Path):
+    with open(Path) as File:
+        return json.load(File)['Results']
+
+
+def Compare(Baseline,Results,Tolerance=0.2):
+    '''Lists the runs that got worse than Baseline by more than Tolerance
+    (relative): slower, fewer F evaluations per second, more iterations to
+    the gap tolerance, more memory, or no longer finishing.'''
+    Regressions = []
+    Worse = {'Time': 1, 'F Evaluations/s': -1, 'Iterations to Tol': 1,
+             'Peak Memory': 1}
+    for key in sorted(set(Baseline) & set(Results)):
+        Old, New = Baseline[key], Results[key]
+        if Old['Status'] == 'ok' and New['Status'] != 'ok':
+            Regressions.append('%s: %s' % (key,New['Status']))
+            continue
+        if Old['Iterations to Tol'] is not None and \
+                New['Iterations to Tol'] is None:
+            Regressions.append('%s: no longer reaches the gap tolerance' %
+                               key)
+        for metric, sign in sorted(Worse.items()):
+            old, new = Old.get(metric), New.get(metric)
+            if old is None or new is None or old == 0:
+                continue
+            Change = sign*(new-old)/abs(old)
+            if Change > Tolerance:
+                Regressions.append('%s: %s %.4g -> %.4g (%+.0f%%)' %
+                                   (key,metric,old,new,100*(new-old)/old))
+    return Regressions
+
+
+def Report(Results):
+    print('%-40s %8s %10s %12s %10s %10s' %
+          ('Case/Solver','Status','Time (s)','F Evals/s','Iter to Tol',
+           'Peak (MB)'))
+    Fmt = lambda value, spec: '-' if value is None else spec % value
+    for key in sorted(Results):
+        Result = Results[key]
+        print('%-40s %8s %10s %12s %10s %10s' %
+              (key,Result['Status'],Fmt(Result['Time'],'%.3f'),
+               Fmt(Result['F Evaluations/s'],'%.0f'),
+               Fmt(Result['Iterations to Tol'],'%d'),
+               Fmt(Result['Peak Memory'],'%.0f')))
+
+
+def main():
+    Parser = argparse.ArgumentParser(description=__doc__.split('\n')[0])
+    Parser.add_argument('--quick',action='store_true',
+                        help='run smaller instances of the large domains')
+    Parser.add_argument('--save',help='write the results to this JSON file')
+    Parser.add_argument('--baseline',
+                        help='report regressions against this JSON file')
+    Parser.add_argument('--tolerance',type=float,default=0.2,
+                        help='relative change counted as a regression')
+    Parser.add_argument('--timeout',type=float,default=600,
+                        help='seconds allowed per run')
+    Parser.add_argument('--cases',nargs='*',help='only run these cases')
+    Parser.add_argument('--solvers',nargs='*',help='only run these solvers')
+    Args = Parser.parse_args()
+
+    Selected = [case for case in Cases(Args.quick)
+                if not Args.cases or case.Name in Args.cases]
+    Classes = [cls for cls in Solvers()
+               if not Args.solvers or cls.__name__ in Args.solvers]
+    Results = Run(Selected,Classes,Timeout=Args.timeout)
+    Report(Results)
+
+    if Args.save:
+        Save(Results,Args.save,Quick=Args.quick)
+    if Args.baseline:
+        Regressions = Compare(Load(Args.baseline),Results,Args.tolerance)
+        print('%d regression(s) against %s' %
+              (len(Regressions),Args.baseline))
+        for regression in Regressions:
+            print('  '+regression)
+        if Regressions:
+            raise SystemExit(1)
+
+if __name__ == '__main__':
+    main()
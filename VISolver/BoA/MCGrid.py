@@ -9,7 +9,7 @@ from VISolver.BoA.Utilities import (
 
 def LE(x):
     # Unpack input - can't use *x with pool.map
-    center_ind,sim,args,grid,shape,eps,q,r,Dinv = x
+    center_ind,sim,args,grid,shape,eps,q,r,Dinv,Modes = x
 
     # Select neighbors
     selected, _ = neighbors(center_ind,grid,r,q,Dinv)
@@ -26,13 +26,14 @@ def LE(x):
         # Run simulation
         results = sim(start,*args)
         # Record results
-        les += [results.TempStorage['Lyapunov'][-1]]
+        # The signature of a start is its leading Modes LEs (all when None)
+        les += [results.TempStorage['Lyapunov'][-1][:Modes]]
         endpts += [results.TempStorage['Data'][-1]]
     return [group_ids,les,endpts]
 
 
 def MC(sim,args,grid,nodes=8,parallel=True,limit=1,AVG=.01,eta_1=1.2,eta_2=.95,
-       eps=1.,L=1,q=2,r=1.1,Dinv=1):
+       eps=1.,L=1,q=2,r=1.1,Dinv=1,Modes=None):
     # Initialize helper variables, uniform distribution, and recording structs
     shape = tuple(grid[:,2])
     ids = range(int(np.prod(shape)))
@@ -60,7 +61,8 @@ def MC(sim,args,grid,nodes=8,parallel=True,limit=1,AVG=.01,eta_1=1.2,eta_2=.95,
         center_ids = np.random.choice(ids,size=L,p=p)
         starts |= set(center_ids)
         center_inds = [int2ind(center_id,shape) for center_id in center_ids]
-        x = [(ind,sim,args,grid,shape,eps,q,r,Dinv) for ind in center_inds]
+        x = [(ind,sim,args,grid,shape,eps,q,r,Dinv,Modes)
+             for ind in center_inds]
 
         # Compute LEs of selected grid points (and their neighbors)
         if parallel:
@@ -1,15 +1,17 @@
 from __future__ import division
+import os
 import numpy as np
 import pathos.multiprocessing as mp  # https://github.com/uqfoundation/pathos
 
 from VISolver.BoA.Utilities import (
     int2ind,ind2pt,ind2int,pt2inds,neighbors,
     update_LERef,adjustLEs2Ref,update_Prob_Data)
+from VISolver.Storage import Dump, Load
 
 
 def LE(x):
     # Unpack input - can't use *x with pool.map
-    center_ind,sim,args,grid,shape,eps,q,r,Dinv = x
+    center_ind,sim,args,grid,shape,eps,q,r,Dinv,Modes = x
 
     # Select neighbors
     selected, _ = neighbors(center_ind,grid,r,q,Dinv)
@@ -31,12 +33,16 @@ def LE(x):
         results = sim(start,*args)
         # Record results
         endpts += [results.TempStorage['Data'][-1]]
-        le = results.TempStorage['Lyapunov'][-1]
+        # The signature of a start is its leading Modes LEs (all when None),
+        # which LEGS solvers built with Modes=k track exactly
+        le = results.TempStorage['Lyapunov'][-1][:Modes]
         les += [le]
 
         # Record fastest evolving component of LE and record time series
+        # (of the signature only, so a trailing, strongly negative LE is
+        # ignored once Modes excludes it)
         c = np.max(np.abs(le))
-        t = np.cumsum([0]+results.PermStorage['Step'][:-1])
+        t = np.cumsum(np.hstack(([0],results.PermStorage['Step'][:-1])))
         T = t[-1]
 
         # Determine cube surrounding starting point
@@ -74,7 +80,7 @@ def LE(x):
 
 
 def MCT(sim,args,grid,nodes=8,parallel=True,limit=1,AVG=.01,eta_1=1.2,eta_2=.95,
-        eps=1.,L=1,q=2,r=1.1,Dinv=1):
+        eps=1.,L=1,q=2,r=1.1,Dinv=1,checkpoint=None,Modes=None):
     # Initialize helper variables, uniform distribution, and recording structs
     shape = tuple(grid[:,2])
     ids = range(int(np.prod(shape)))
@@ -95,6 +101,13 @@ def MCT(sim,args,grid,nodes=8,parallel=True,limit=1,AVG=.01,eta_1=1.2,eta_2=.95,
     # Initalize counters
     i = 0
     avg = np.inf
+
+    # Pick up where a previous run left off
+    if checkpoint is not None and os.path.exists(checkpoint):
+        (ref,ref_ept,data,p,B_pairs,bndry_ids_master,starts,i,avg,
+         rng) = Load(checkpoint)
+        np.random.set_state(rng)
+
     while (i < limit) and (avg > AVG):
         print('Iteration '+repr(i))
 
@@ -102,7 +115,8 @@ def MCT(sim,args,grid,nodes=8,parallel=True,limit=1,AVG=.01,eta_1=1.2,eta_2=.95,
         center_ids = np.random.choice(ids,size=L,p=p)
         starts |= set(center_ids)
         center_inds = [int2ind(center_id,shape) for center_id in center_ids]
-        x = [(ind,sim,args,grid,shape,eps,q,r,Dinv) for ind in center_inds]
+        x = [(ind,sim,args,grid,shape,eps,q,r,Dinv,Modes)
+             for ind in center_inds]
 
         # Compute LEs of selected grid points (and their neighbors)
         if parallel:
@@ -151,4 +165,9 @@ def MCT(sim,args,grid,nodes=8,parallel=True,limit=1,AVG=.01,eta_1=1.2,eta_2=.95,
         i += 1
         avg = B_pairs/((q+1)*L*i)
         bndry_ids_master |= bndry_ids_all
+
+        # Save progress so an interrupted run can be resumed
+        if checkpoint is not None:
+            Dump((ref,ref_ept,data,p,B_pairs,bndry_ids_master,starts,i,avg,
+                  np.random.get_state()),checkpoint)
     return ref, data, p, i, avg, bndry_ids_master, starts
@@ -6,8 +6,6 @@ from matplotlib.colors import LinearSegmentedColormap as lsc
 
 from VISolver.BoA.Utilities import ind2int
 
-from sklearn.svm import SVC
-
 
 def onclick(event):
     # Records click locations to global variable on click event
@@ -95,6 +93,8 @@ def plotBoA(ref,data,grid,obs=None,consts=None,Neval=500,txt_locs=None,
             Y = np.zeros(len(samples)*2)
             Y[:n] = 1
 
+            # sklearn is only needed (and loaded) for boundary fitting
+            from sklearn.svm import SVC
             clf = SVC()
             clf.fit(X,Y)
 
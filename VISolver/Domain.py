@@ -1,3 +1,8 @@
+import importlib
+from collections import OrderedDict
+
+import numpy as np
+
 
 class Domain(object):
 
@@ -5,3 +10,100 @@ class Domain(object):
         raise NotImplementedError(
             'This is a generic domain object. '
             'You need to pick a specific domain to use.')
+
+    def F_Batch(self,Data):
+        '''Evaluates F on every row of Data. Domains whose mapping is
+        naturally vectorized override this.'''
+        return np.array([self.F(x) for x in Data])
+
+    def Astype(self,dtype):
+        '''Stores the domain's floating-point array attributes (e.g. the
+        matrix and offset of an affine domain) in dtype and returns the
+        arrays replaced, keyed by attribute name, so they can be restored.
+        Halving the precision halves their memory and roughly doubles the
+        throughput of F for large affine domains.'''
+        Replaced = {}
+        for name, value in list(vars(self).items()):
+            if isinstance(value,np.ndarray) and value.dtype.kind == 'f' and \
+                    value.dtype != dtype:
+                Replaced[name] = value
+                setattr(self,name,value.astype(dtype))
+        return Replaced
+
+    def CacheF(self,Size=4):
+        '''Memoizes F on the last Size distinct points it was evaluated at so
+        the solver, gap functions and termination checks share a single
+        evaluation per iterate. Call before constructing the solver, which
+        keeps a reference to Domain.F.'''
+        if not isinstance(self.F,FCache):
+            self.F = FCache(self.F,Size=Size)
+        return self.F
+
+
+class Visual(object):
+    '''Mixin for domains whose runs can be animated (see
+    Demo_SOIAnimation.py).
+
+    FlowNormalizeColormap, InitVisual and UpdateVisual are implemented as
+    functions of the domain in the module named by Visuals. That module, and
+    matplotlib with it, is only imported once one of them is first called, so
+    processes that only solve the domain never pay for loading it.
+    '''
+
+    Visuals = None
+
+    def Visualization(self):
+        Module = importlib.import_module(self.Visuals)
+        if 'to_rgba' not in vars(self):
+            Module.DefaultColormap(self)
+        return Module
+
+    def FlowNormalizeColormap(self,Data,cmap):
+        return self.Visualization().FlowNormalizeColormap(self,Data,cmap)
+
+    def InitVisual(self):
+        return self.Visualization().InitVisual(self)
+
+    def UpdateVisual(self,num,ax,Frames,annotations):
+        return self.Visualization().UpdateVisual(self,num,ax,Frames,
+                                                 annotations)
+
+
+class FCache(object):
+    '''Size-bounded, least-recently-used cache around a mapping F.
+
+    Points are keyed by their contents, so in-place reuse of iterate buffers
+    is safe. Cached values are returned read-only since every caller of F at
+    that point shares them. Hits and Misses count cache lookups.
+    '''
+
+    def __init__(self,F,Size=4):
+        assert Size >= 1
+        self.F = F
+        # Stands in for F wherever it is identified by name (checkpoint keys,
+        # disk-backed records and reports)
+        self.__name__ = self.func_name = getattr(F,'__name__','F')
+        self.Size = Size
+        self.Cache = OrderedDict()
+        self.Hits = 0
+        self.Misses = 0
+
+    def __call__(self,Data):
+        Data = np.asarray(Data)
+        key = (Data.shape,Data.dtype.str,Data.tobytes())
+        if key in self.Cache:
+            self.Hits += 1
+            Value = self.Cache.pop(key)
+        else:
+            self.Misses += 1
+            Value = np.asarray(self.F(Data))
+            Value.flags.writeable = False
+            if len(self.Cache) >= self.Size:
+                self.Cache.popitem(last=False)
+        self.Cache[key] = Value
+        return Value
+
+    def Clear(self):
+        self.Cache.clear()
+        self.Hits = 0
+        self.Misses = 0
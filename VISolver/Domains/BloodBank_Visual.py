@@ -0,0 +1,131 @@
+import numpy as np
+
+import matplotlib as mpl
+import matplotlib.pyplot as plt
+import matplotlib.collections as mc
+import matplotlib.cm as cm
+
+
+# Functions Used to Animate and Save Network Run to Movie File
+# (see Visual in VISolver.Domain)
+
+def DefaultColormap(Domain):
+    Domain.cmap = cm.Reds
+    norm = mpl.colors.Normalize(vmin=0.,vmax=1.)
+    to_rgba = cm.ScalarMappable(norm=norm, cmap=Domain.cmap).to_rgba
+    Domain.to_rgba = [to_rgba]*6
+
+
+def FlowNormalizeColormap(Domain,Data,cmap):
+    Domain.cmap = cmap
+    maxFlows = [0]*6
+    for data in Data:
+        x2f = Domain.PathFlow2LinkFlow_x2f
+        flows = list(x2f(Domain.UnpackPathFlows(data)))
+        newFlows = [np.max(flow) for flow in flows]
+        maxFlows = np.max([maxFlows,newFlows],axis=0)
+    norm = [mpl.colors.Normalize(vmin=0.,vmax=mxf) for mxf in maxFlows]
+    Domain.to_rgba = [cm.ScalarMappable(norm=n, cmap=Domain.cmap).to_rgba
+                      for n in norm]
+
+
+def InitVisual(Domain):
+
+    ax = plt.gca()
+    fig = plt.gcf()
+
+    # Add Colorbar
+    cax = fig.add_axes([0.95, 0.2, 0.02, 0.6])
+    plt.axis('off')
+    cb = mpl.colorbar.ColorbarBase(cax, cmap=Domain.cmap,
+                                   spacing='proportional')
+    cb.set_label('Blood Flow')
+
+    plt.sca(ax)
+
+    # Create Network Skeleton
+    Ox = (max([Domain.nC,Domain.nB,Domain.nD,Domain.nR]) - 1.)/2.
+    Cx = np.linspace(Ox-(Domain.nC-1.)/2.,Ox+(Domain.nC-1.)/2.,Domain.nC)
+    Bx = np.linspace(Ox-(Domain.nB-1.)/2.,Ox+(Domain.nB-1.)/2.,Domain.nB)
+    Px = np.linspace(Ox-(Domain.nB-1.)/2.,Ox+(Domain.nB-1.)/2.,Domain.nB)
+    Sx = np.linspace(Ox-(Domain.nB-1.)/2.,Ox+(Domain.nB-1.)/2.,Domain.nB)
+    Dx = np.linspace(Ox-(Domain.nD-1.)/2.,Ox+(Domain.nD-1.)/2.,Domain.nD)
+    Rx = np.linspace(Ox-(Domain.nR-1.)/2.,Ox+(Domain.nR-1.)/2.,Domain.nR)
+
+    Oy = 6.
+    Cy = 5.
+    By = 4.
+    Py = 3.
+    Sy = 2.
+    Dy = 1.
+    Ry = 0.
+
+    od = []
+    for c in xrange(Domain.nC):
+        od.append([(Ox,Oy),(Cx[c],Cy)])
+    for c in xrange(Domain.nC):
+        for b in xrange(Domain.nB):
+            od.append([(Cx[c],Cy),(Bx[b],By)])
+    for b in xrange(Domain.nB):
+        od.append([(Bx[b],By),(Px[b],Py)])
+    for p in xrange(Domain.nB):
+        od.append([(Px[p],Py),(Sx[p],Sy)])
+    for s in xrange(Domain.nB):
+        for d in xrange(Domain.nD):
+            od.append([(Sx[s],Sy),(Dx[d],Dy)])
+    for d in xrange(Domain.nD):
+        for r in xrange(Domain.nR):
+            od.append([(Dx[d],Dy),(Rx[r],Ry)])
+    lc = mc.LineCollection(od, colors=(0,0,0,0), linewidths=10)
+    ax.add_collection(lc)
+    ax.set_xlim((0,2*Ox))
+    ax.set_ylim((-.5,6.5))
+    ax.add_collection(lc)
+
+    # Annotate Plot
+    plt.box('off')
+    plt.yticks([0,1,2,3,4,5,6],['Hospitals', 'Distribution', 'Storage',
+                                'Labs', 'Blood Centers', 'Collection',
+                                'Organization'], rotation=45)
+    plt.xticks(Rx,['Hospital\n'+str(r+1) for r in xrange(Domain.nR)])
+    plt.tick_params(axis='y',right='off')
+    plt.tick_params(axis='x',top='off')
+
+    return ax.collections
+
+
+def UpdateVisual(Domain,num,ax,Frames,annotations):
+
+    Data = Frames[num]
+
+    # Check for Next Annotation
+    if len(annotations) > 0:
+        ann = annotations[-1]
+        if num >= ann[0]:
+            ann[1](ann[2])
+            annotations.pop()
+
+    # Unpack Data
+    f_1C, f_CB, f_BP, f_PS, f_SD, f_DR = \
+        Domain.PathFlow2LinkFlow_x2f(Domain.UnpackPathFlows(Data))
+
+    colors = []
+    for c in xrange(Domain.nC):
+        colors.append(Domain.to_rgba[0](f_1C[c]))
+    for c in xrange(Domain.nC):
+        for b in xrange(Domain.nB):
+            colors.append(Domain.to_rgba[1](f_CB[c,b]))
+    for b in xrange(Domain.nB):
+        colors.append(Domain.to_rgba[2](f_BP[b]))
+    for p in xrange(Domain.nB):
+        colors.append(Domain.to_rgba[3](f_PS[p]))
+    for s in xrange(Domain.nB):
+        for d in xrange(Domain.nD):
+            colors.append(Domain.to_rgba[4](f_SD[s,d]))
+    for d in xrange(Domain.nD):
+        for r in xrange(Domain.nR):
+            colors.append(Domain.to_rgba[5](f_DR[d,r]))
+
+    ax.collections[0].set_color(colors)
+
+    return ax.collections
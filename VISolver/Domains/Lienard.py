@@ -14,6 +14,10 @@ class Lienard(Domain):
         dxy = np.array([y-.32*(x**5.)+4./3.*(x**3.)-.8*x,-x])
         return dxy
 
+    def F_Batch(self,Data):
+        x,y = Data.T
+        return np.column_stack((y-.32*(x**5.)+4./3.*(x**3.)-.8*x,-x))
+
     def Jac(self,Data):
         x,y = Data
         return np.array([[-5.*.32*(x**4.)+4.*(x**2.)-.8,1.],[-1.,0.]])
@@ -5,20 +5,29 @@ from VISolver.Domain import Domain
 
 class MHPH(Domain):
 
-    def __init__(self,Dim=1000):
+    def __init__(self,Dim=1000,dtype=np.float64):
         self.Dim = Dim
         self.Min = 0.0
         self.L = (15.0*np.double(Dim))**2
         M = np.random.uniform(low=-15,high=-12,size=(self.Dim,self.Dim))
         self.A = np.dot(M,M.T)
         self.b = np.random.uniform(low=-500,high=0,size=self.Dim)
+        self.Astype(dtype)
 
     def F(self,Data):
         return np.dot(self.A,Data)+self.b
 
+    def F_Batch(self,Data):
+        return np.dot(Data,self.A.T)+self.b
+
+    def Jac(self,Data):
+        return self.A
+
     def gap_simplex(self,Data):
+        # Accumulate in double precision whatever the precision of F
         gap = 0.0
-        F = np.ravel(self.F(Data))
+        F = np.asarray(np.ravel(self.F(Data)),dtype=np.float64)
+        Data = np.asarray(Data,dtype=np.float64)
         count = 0
         z = 1.0
         for ind in abs(F).argsort()[::-1]:
@@ -1,15 +1,11 @@
 import numpy as np
 
-import matplotlib as mpl
-mpl.use("Agg")
-import matplotlib.pyplot as plt
-import matplotlib.collections as mc
-import matplotlib.cm as cm
+from VISolver.Domain import Domain, Visual
 
-from VISolver.Domain import Domain
 
+class SOI(Visual,Domain):
 
-class SOI(Domain):
+    Visuals = 'VISolver.Domains.SOI_Visual'
 
     def __init__(self,Network,alpha=2):
         self.UnpackNetwork(Network)
@@ -17,10 +13,6 @@ class SOI(Domain):
         self.Dim = self.CalculateNetworkSize()
         self.alpha = alpha
 
-        self.cmap = cm.rainbow
-        norm = mpl.colors.Normalize(vmin=0.,vmax=1.)
-        self.to_rgba = [cm.ScalarMappable(norm=norm, cmap=self.cmap).to_rgba]*3
-
     def F(self,Data):
         return self.F_P2UP(Data)
 
@@ -32,94 +24,6 @@ class SOI(Domain):
 
         return np.dot(dFdX,Z) - self.alpha/2.*np.dot(Z,Z)
 
-    # Functions Used to Animate and Save Network Run to Movie File
-
-    def FlowNormalizeColormap(self,Data,cmap):
-        self.cmap = cmap
-        maxFlows = [0]*2
-        for data in Data:
-            flows = list(self.PathFlow2LinkFlow_x2f(*self.UnpackData(data))[0])
-            newFlows = [np.max(flow) for flow in flows]
-            maxFlows = np.max([maxFlows,newFlows],axis=0)
-        norm = [mpl.colors.Normalize(vmin=0.,vmax=mxf) for mxf in maxFlows]
-        self.to_rgba = [cm.ScalarMappable(norm=n, cmap=self.cmap).to_rgba
-                        for n in norm]
-
-    def InitVisual(self):
-
-        ax = plt.gca()
-        fig = plt.gcf()
-
-        # Add Colorbar
-        cax = fig.add_axes([0.95, 0.2, 0.02, 0.6])
-        plt.axis('off')
-        cb = mpl.colorbar.ColorbarBase(cax, cmap=self.cmap,
-                                       spacing='proportional')
-        cb.set_label('Internet Traffic (Q)')
-
-        plt.sca(ax)
-
-        # Create Network Skeleton
-        mid = (max([self.m,self.n,self.o]) - 1.)/2.
-        Ix = np.linspace(mid-(self.m-1.)/2.,mid+(self.m-1.)/2.,self.m)
-        Jx = np.linspace(mid-(self.n-1.)/2.,mid+(self.n-1.)/2.,self.n)
-        Kx = np.linspace(mid-(self.o-1.)/2.,mid+(self.o-1.)/2.,self.o)
-
-        Iy = 2.
-        Jy = 1.
-        Ky = 0.
-
-        od = []
-        for i in xrange(self.m):
-            for j in xrange(self.n):
-                od.append([(Ix[i],Iy),(Jx[j],Jy)])
-        for j in xrange(self.n):
-            for k in xrange(self.o):
-                od.append([(Jx[j],Jy),(Kx[k],Ky)])
-        lc = mc.LineCollection(od, colors=(0,0,0,0), linewidths=10)
-        ax.add_collection(lc)
-        ax.set_xlim((0,2*mid))
-        ax.set_ylim((-.5,2.5))
-        ax.add_collection(lc)
-
-        # Annotate Plot
-        plt.box('off')
-        plt.yticks([0,1,2],['Demand\nMarkets', 'Network\nProviders',
-                            'Service\nProviders'], rotation=45)
-        plt.xticks(Kx,['Market\n'+str(k+1) for k in xrange(self.o)])
-        plt.tick_params(axis='y',right='off')
-        plt.tick_params(axis='x',top='off')
-
-        return ax.collections
-
-    def UpdateVisual(self,num,ax,Frames,annotations):
-
-        Data = Frames[num]
-
-        # Check for Next Annotation
-        if len(annotations) > 0:
-            ann = annotations[-1]
-            if num >= ann[0]:
-                ann[1](ann[2])
-                annotations.pop()
-
-        # Unpack Data
-        f_Q, f_q, f_Pi = self.PathFlow2LinkFlow_x2f(*self.UnpackData(Data))
-        f_Q_top = f_Q[0]
-        f_Q_bot = f_Q[1]
-
-        colors = []
-        for i in xrange(self.m):
-            for j in xrange(self.n):
-                colors.append(self.to_rgba[0](f_Q_top[i,j]))
-        for j in xrange(self.n):
-            for k in xrange(self.o):
-                colors.append(self.to_rgba[1](f_Q_bot[j,k]))
-
-        ax.collections[0].set_color(colors)
-
-        return ax.collections
-
     # Functions used to Initialize the BloodBank Network and Calculate F
 
     def UnpackNetwork(self,Network):
@@ -0,0 +1,106 @@
+import numpy as np
+
+import matplotlib as mpl
+import matplotlib.pyplot as plt
+import matplotlib.collections as mc
+import matplotlib.cm as cm
+
+
+# Functions Used to Animate and Save Network Run to Movie File
+# (see Visual in VISolver.Domain)
+
+def DefaultColormap(Domain):
+    Domain.cmap = cm.rainbow
+    norm = mpl.colors.Normalize(vmin=0.,vmax=1.)
+    to_rgba = cm.ScalarMappable(norm=norm, cmap=Domain.cmap).to_rgba
+    Domain.to_rgba = [to_rgba]*3
+
+
+def FlowNormalizeColormap(Domain,Data,cmap):
+    Domain.cmap = cmap
+    maxFlows = [0]*2
+    for data in Data:
+        x2f = Domain.PathFlow2LinkFlow_x2f
+        flows = list(x2f(*Domain.UnpackData(data))[0])
+        newFlows = [np.max(flow) for flow in flows]
+        maxFlows = np.max([maxFlows,newFlows],axis=0)
+    norm = [mpl.colors.Normalize(vmin=0.,vmax=mxf) for mxf in maxFlows]
+    Domain.to_rgba = [cm.ScalarMappable(norm=n, cmap=Domain.cmap).to_rgba
+                      for n in norm]
+
+
+def InitVisual(Domain):
+
+    ax = plt.gca()
+    fig = plt.gcf()
+
+    # Add Colorbar
+    cax = fig.add_axes([0.95, 0.2, 0.02, 0.6])
+    plt.axis('off')
+    cb = mpl.colorbar.ColorbarBase(cax, cmap=Domain.cmap,
+                                   spacing='proportional')
+    cb.set_label('Internet Traffic (Q)')
+
+    plt.sca(ax)
+
+    # Create Network Skeleton
+    mid = (max([Domain.m,Domain.n,Domain.o]) - 1.)/2.
+    Ix = np.linspace(mid-(Domain.m-1.)/2.,mid+(Domain.m-1.)/2.,Domain.m)
+    Jx = np.linspace(mid-(Domain.n-1.)/2.,mid+(Domain.n-1.)/2.,Domain.n)
+    Kx = np.linspace(mid-(Domain.o-1.)/2.,mid+(Domain.o-1.)/2.,Domain.o)
+
+    Iy = 2.
+    Jy = 1.
+    Ky = 0.
+
+    od = []
+    for i in xrange(Domain.m):
+        for j in xrange(Domain.n):
+            od.append([(Ix[i],Iy),(Jx[j],Jy)])
+    for j in xrange(Domain.n):
+        for k in xrange(Domain.o):
+            od.append([(Jx[j],Jy),(Kx[k],Ky)])
+    lc = mc.LineCollection(od, colors=(0,0,0,0), linewidths=10)
+    ax.add_collection(lc)
+    ax.set_xlim((0,2*mid))
+    ax.set_ylim((-.5,2.5))
+    ax.add_collection(lc)
+
+    # Annotate Plot
+    plt.box('off')
+    plt.yticks([0,1,2],['Demand\nMarkets', 'Network\nProviders',
+                        'Service\nProviders'], rotation=45)
+    plt.xticks(Kx,['Market\n'+str(k+1) for k in xrange(Domain.o)])
+    plt.tick_params(axis='y',right='off')
+    plt.tick_params(axis='x',top='off')
+
+    return ax.collections
+
+
+def UpdateVisual(Domain,num,ax,Frames,annotations):
+
+    Data = Frames[num]
+
+    # Check for Next Annotation
+    if len(annotations) > 0:
+        ann = annotations[-1]
+        if num >= ann[0]:
+            ann[1](ann[2])
+            annotations.pop()
+
+    # Unpack Data
+    f_Q, f_q, f_Pi = Domain.PathFlow2LinkFlow_x2f(*Domain.UnpackData(Data))
+    f_Q_top = f_Q[0]
+    f_Q_bot = f_Q[1]
+
+    colors = []
+    for i in xrange(Domain.m):
+        for j in xrange(Domain.n):
+            colors.append(Domain.to_rgba[0](f_Q_top[i,j]))
+    for j in xrange(Domain.n):
+        for k in xrange(Domain.o):
+            colors.append(Domain.to_rgba[1](f_Q_bot[j,k]))
+
+    ax.collections[0].set_color(colors)
+
+    return ax.collections
@@ -16,5 +16,8 @@ class Sphere(Domain):
     def F(self,Data):
         return 2.0*Data
 
+    def F_Batch(self,Data):
+        return 2.0*Data
+
     def f_Error(self,Data):
         return self.f(Data) - self.Min
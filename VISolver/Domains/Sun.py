@@ -5,22 +5,32 @@ from VISolver.Domain import Domain
 
 class Sun(Domain):
 
-    def __init__(self,Dim=8000):
+    def __init__(self,Dim=8000,dtype=np.float64):
         self.Dim = Dim
         self.Min = 0.0
         self.L = (2.0*np.double(Dim))**2
-        L = np.zeros((self.Dim,self.Dim))
-        U = np.triu(2*np.ones((self.Dim,self.Dim)),1)
-        D = np.diag(np.ones(self.Dim),0)
-        self.A = L+U+D
-        self.b = -1*np.ones(self.Dim)
+        # Upper triangle of 2s over a unit diagonal, built in place
+        U = np.ones((self.Dim,self.Dim),dtype=dtype)
+        U *= 2
+        self.A = np.triu(U,1)
+        del U
+        self.A[np.diag_indices(self.Dim)] = 1
+        self.b = -1*np.ones(self.Dim,dtype=dtype)
 
     def F(self,Data):
         return np.dot(self.A,Data)+self.b
 
+    def F_Batch(self,Data):
+        return np.dot(Data,self.A.T)+self.b
+
+    def Jac(self,Data):
+        return self.A
+
     def gap_simplex(self,Data):
+        # Accumulate in double precision whatever the precision of F
         gap = 0.0
-        F = np.ravel(self.F(Data))
+        F = np.asarray(np.ravel(self.F(Data)),dtype=np.float64)
+        Data = np.asarray(Data,dtype=np.float64)
         count = 0
         z = 1.0
         for ind in abs(F).argsort()[::-1]:
@@ -1,17 +1,14 @@
 import numpy as np
 
-import matplotlib as mpl
-mpl.use("Agg")
-import matplotlib.pyplot as plt
-import matplotlib.collections as mc
-import matplotlib.cm as cm
+from VISolver.Domain import Domain, Visual
 
-from VISolver.Domain import Domain
 
-
-class SupplyChain(Domain):
+class SupplyChain(Visual,Domain):
     '''Current representation does not allow for different modes of
     transportation nor 'factory-direct' distribution.'''
+
+    Visuals = 'VISolver.Domains.SupplyChain_Visual'
+
     def __init__(self,Network,alpha=2):
         self.UnpackNetwork(Network)
         self.Network = (self.I,self.Nm,self.Nd,self.Nr)
@@ -24,10 +21,6 @@ class SupplyChain(Domain):
                                              (self.I,self.Nd),
                                              (self.I,self.Nd,self.Nr)]
 
-        self.cmap = cm.rainbow
-        norm = mpl.colors.Normalize(vmin=0.,vmax=1.)
-        self.to_rgba = [cm.ScalarMappable(norm=norm, cmap=self.cmap).to_rgba]*4
-
     def F(self,Data):
         return self.F_P2UP(Data)
 
@@ -39,117 +32,6 @@ class SupplyChain(Domain):
 
         return np.dot(dFdX,Z) - self.alpha/2.*np.dot(Z,Z)
 
-    # Functions Used to Animate and Save Network Run to Movie File
-
-    def FlowNormalizeColormap(self,Data,cmap):
-        self.cmap = cmap
-        maxFlows = [0]*4
-        for data in Data:
-            x = self.UnpackData(data)[0]
-            xflows = list(self.PathFlow2LinkFlow_x2f(x))
-            newFlows = [np.max(flow) for flow in xflows]
-            maxFlows = np.max([maxFlows,newFlows],axis=0)
-        norm = [mpl.colors.Normalize(vmin=0.,vmax=mxf) for mxf in maxFlows]
-        self.to_rgba = \
-            [cm.ScalarMappable(norm=n, cmap=self.cmap).to_rgba for n in norm]
-
-    def InitVisual(self):
-
-        ax = plt.gca()
-        fig = plt.gcf()
-
-        # Add Colorbar
-        cax = fig.add_axes([0.95, 0.2, 0.02, 0.6])
-        plt.axis('off')
-        cb = mpl.colorbar.ColorbarBase(cax, cmap=self.cmap)
-        cb.set_label('Suppy Chain Product Flow (Q)')
-
-        plt.sca(ax)
-
-        # Create Network Skeleton
-        mid = (max([self.I,self.I*self.Nm,self.I*self.Nd,self.Nr]) - 1.)/2.
-        Ix = np.linspace(mid-(self.I-1.)/2.,
-                         mid+(self.I-1.)/2.,self.I)
-        Iy = 4.
-        Mx = np.linspace(mid-(self.I*self.Nm-1.)/2.,
-                         mid+(self.I*self.Nm-1.)/2.,self.I*self.Nm)
-        My = 3.
-        D1x = np.linspace(mid-(self.I*self.Nd-1.)/2.,
-                          mid+(self.I*self.Nd-1.)/2.,self.I*self.Nd)
-        D1y = 2.
-        D2x = D1x
-        D2y = 1.
-        Rx = np.linspace(mid-(self.Nr-1.)/2.,mid+(self.Nr-1.)/2.,self.Nr)
-        Ry = 0.
-        od = []
-        for i in xrange(self.I):
-            for m in xrange(self.Nm):
-                od.append([(Ix[i],Iy),(Mx[i*self.Nm+m],My)])
-        for i in xrange(self.I):
-            for m in xrange(self.Nm):
-                for d1 in xrange(self.Nd):
-                    od.append([(Mx[i*self.Nm+m],My),(D1x[i*self.Nd+d1],D1y)])
-        for i in xrange(self.I):
-            for d1 in xrange(self.Nd):
-                od.append([(D1x[i*self.Nd+d1],D1y),(D2x[i*self.Nd+d1],D2y)])
-        for i in xrange(self.I):
-            for d2 in xrange(self.Nd):
-                for r in xrange(self.Nr):
-                    od.append([(D2x[i*self.Nd+d2],D2y),(Rx[r],Ry)])
-
-        lc = mc.LineCollection(od, colors=(0,0,0,0), linewidths=10)
-        ax.add_collection(lc)
-        ax.set_xlim((0,2*mid))
-        ax.set_ylim((-.5,4.5))
-        ax.add_collection(lc)
-
-        # Annotate Plot
-        plt.box('off')
-        plt.yticks(xrange(5),['Demand\nMarkets', 'Warehouses',
-                              'Transportation', 'Manufacturing\nPlants',
-                              'Firms'],
-                   rotation=45)
-        plt.xticks(Rx,['Market\n'+str(r+1) for r in xrange(self.Nr)])
-        plt.tick_params(axis='y',right='off')
-        plt.tick_params(axis='x',top='off')
-
-        return ax.collections
-
-    def UpdateVisual(self,num,ax,Frames,annotations):
-
-        Data = Frames[num]
-
-        # Check for Next Annotation
-        if len(annotations) > 0:
-            ann = annotations[-1]
-            if num >= ann[0]:
-                ann[1](ann[2])
-                annotations.pop()
-
-        # Unpack Data
-        f_IM, f_MD1, f_D1D2, f_D2R = \
-            self.PathFlow2LinkFlow_x2f(self.UnpackData(Data)[0])
-
-        colors = []
-        for i in xrange(self.I):
-            for m in xrange(self.Nm):
-                colors.append(self.to_rgba[0](f_IM[i,m]))
-        for i in xrange(self.I):
-            for m in xrange(self.Nm):
-                for d1 in xrange(self.Nd):
-                    colors.append(self.to_rgba[1](f_MD1[i,m,d1]))
-        for i in xrange(self.I):
-            for d1 in xrange(self.Nd):
-                colors.append(self.to_rgba[2](f_D1D2[i,d1]))
-        for i in xrange(self.I):
-            for d2 in xrange(self.Nd):
-                for r in xrange(self.Nr):
-                    colors.append(self.to_rgba[3](f_D2R[i,d2,r]))
-
-        ax.collections[0].set_color(colors)
-
-        return ax.collections
-
     # Functions used to Initialize the BloodBank Network and Calculate F
 
     def UnpackNetwork(self,Network):
@@ -0,0 +1,129 @@
+import numpy as np
+
+import matplotlib as mpl
+import matplotlib.pyplot as plt
+import matplotlib.collections as mc
+import matplotlib.cm as cm
+
+
+# Functions Used to Animate and Save Network Run to Movie File
+# (see Visual in VISolver.Domain)
+
+def DefaultColormap(Domain):
+    Domain.cmap = cm.rainbow
+    norm = mpl.colors.Normalize(vmin=0.,vmax=1.)
+    to_rgba = cm.ScalarMappable(norm=norm, cmap=Domain.cmap).to_rgba
+    Domain.to_rgba = [to_rgba]*4
+
+
+def FlowNormalizeColormap(Domain,Data,cmap):
+    Domain.cmap = cmap
+    maxFlows = [0]*4
+    for data in Data:
+        x = Domain.UnpackData(data)[0]
+        xflows = list(Domain.PathFlow2LinkFlow_x2f(x))
+        newFlows = [np.max(flow) for flow in xflows]
+        maxFlows = np.max([maxFlows,newFlows],axis=0)
+    norm = [mpl.colors.Normalize(vmin=0.,vmax=mxf) for mxf in maxFlows]
+    Domain.to_rgba = \
+        [cm.ScalarMappable(norm=n, cmap=Domain.cmap).to_rgba for n in norm]
+
+
+def InitVisual(Domain):
+
+    ax = plt.gca()
+    fig = plt.gcf()
+
+    # Add Colorbar
+    cax = fig.add_axes([0.95, 0.2, 0.02, 0.6])
+    plt.axis('off')
+    cb = mpl.colorbar.ColorbarBase(cax, cmap=Domain.cmap)
+    cb.set_label('Suppy Chain Product Flow (Q)')
+
+    plt.sca(ax)
+
+    # Create Network Skeleton
+    mid = (max([Domain.I,Domain.I*Domain.Nm,Domain.I*Domain.Nd,
+                Domain.Nr]) - 1.)/2.
+    Ix = np.linspace(mid-(Domain.I-1.)/2.,
+                     mid+(Domain.I-1.)/2.,Domain.I)
+    Iy = 4.
+    Mx = np.linspace(mid-(Domain.I*Domain.Nm-1.)/2.,
+                     mid+(Domain.I*Domain.Nm-1.)/2.,Domain.I*Domain.Nm)
+    My = 3.
+    D1x = np.linspace(mid-(Domain.I*Domain.Nd-1.)/2.,
+                      mid+(Domain.I*Domain.Nd-1.)/2.,Domain.I*Domain.Nd)
+    D1y = 2.
+    D2x = D1x
+    D2y = 1.
+    Rx = np.linspace(mid-(Domain.Nr-1.)/2.,mid+(Domain.Nr-1.)/2.,Domain.Nr)
+    Ry = 0.
+    od = []
+    for i in xrange(Domain.I):
+        for m in xrange(Domain.Nm):
+            od.append([(Ix[i],Iy),(Mx[i*Domain.Nm+m],My)])
+    for i in xrange(Domain.I):
+        for m in xrange(Domain.Nm):
+            for d1 in xrange(Domain.Nd):
+                od.append([(Mx[i*Domain.Nm+m],My),(D1x[i*Domain.Nd+d1],D1y)])
+    for i in xrange(Domain.I):
+        for d1 in xrange(Domain.Nd):
+            od.append([(D1x[i*Domain.Nd+d1],D1y),(D2x[i*Domain.Nd+d1],D2y)])
+    for i in xrange(Domain.I):
+        for d2 in xrange(Domain.Nd):
+            for r in xrange(Domain.Nr):
+                od.append([(D2x[i*Domain.Nd+d2],D2y),(Rx[r],Ry)])
+
+    lc = mc.LineCollection(od, colors=(0,0,0,0), linewidths=10)
+    ax.add_collection(lc)
+    ax.set_xlim((0,2*mid))
+    ax.set_ylim((-.5,4.5))
+    ax.add_collection(lc)
+
+    # Annotate Plot
+    plt.box('off')
+    plt.yticks(xrange(5),['Demand\nMarkets', 'Warehouses',
+                          'Transportation', 'Manufacturing\nPlants',
+                          'Firms'],
+               rotation=45)
+    plt.xticks(Rx,['Market\n'+str(r+1) for r in xrange(Domain.Nr)])
+    plt.tick_params(axis='y',right='off')
+    plt.tick_params(axis='x',top='off')
+
+    return ax.collections
+
+
+def UpdateVisual(Domain,num,ax,Frames,annotations):
+
+    Data = Frames[num]
+
+    # Check for Next Annotation
+    if len(annotations) > 0:
+        ann = annotations[-1]
+        if num >= ann[0]:
+            ann[1](ann[2])
+            annotations.pop()
+
+    # Unpack Data
+    f_IM, f_MD1, f_D1D2, f_D2R = \
+        Domain.PathFlow2LinkFlow_x2f(Domain.UnpackData(Data)[0])
+
+    colors = []
+    for i in xrange(Domain.I):
+        for m in xrange(Domain.Nm):
+            colors.append(Domain.to_rgba[0](f_IM[i,m]))
+    for i in xrange(Domain.I):
+        for m in xrange(Domain.Nm):
+            for d1 in xrange(Domain.Nd):
+                colors.append(Domain.to_rgba[1](f_MD1[i,m,d1]))
+    for i in xrange(Domain.I):
+        for d1 in xrange(Domain.Nd):
+            colors.append(Domain.to_rgba[2](f_D1D2[i,d1]))
+    for i in xrange(Domain.I):
+        for d2 in xrange(Domain.Nd):
+            for r in xrange(Domain.Nr):
+                colors.append(Domain.to_rgba[3](f_D2R[i,d2,r]))
+
+    ax.collections[0].set_color(colors)
+
+    return ax.collections
@@ -26,6 +26,9 @@ class Watson(Domain):
     def F(self,Data):
         return np.dot(self.A,Data)+self.b
 
+    def F_Batch(self,Data):
+        return np.dot(Data,self.A.T)+self.b
+
     def gap_simplex(self,Data):
         gap = 0.0
         F = np.ravel(self.F(Data))
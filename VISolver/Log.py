@@ -1,6 +1,9 @@
 from __future__ import print_function
 import numpy as np
 
+from VISolver.Options import ReduceSum
+from VISolver.Storage import Reduction
+
 
 def PrintSimStats(Domain, Method, Options):
     print('------------------------------------------------------------------')
@@ -35,14 +38,42 @@ def PrintSimResults(Options, Results, Method, Time):
                 print('%s: %g' % (req_str, Results.TempStorage[req][-1]))
             except TypeError:
                 print('%s: %s' % (req_str, Results.TempStorage[req][-1]))
+        elif isinstance(Results.PermStorage[req],Reduction):
+            print('%s: %s' % (req_str, Results.PermStorage[req].Result()))
         else:
             try:
                 print('%s: %g' % (req_str, Results.PermStorage[req][-1]))
             except TypeError:
                 print('%s: %s' % (req_str, Results.PermStorage[req][-1]))
     print('Steps: %d' % Results.thisPermIndex)
+    TerminatedBy = getattr(Results,'TerminatedBy',None)
+    if TerminatedBy is not None:
+        if hasattr(TerminatedBy,'func_name'):
+            TerminatedBy = TerminatedBy.func_name
+        print('Terminated By: %s' % TerminatedBy)
+    if getattr(Results,'SwitchedAt',None) is not None:
+        print('Switched Precision At: %d' % Results.SwitchedAt)
+    if hasattr(Method.F,'Hits'):
+        print('F Cache Hits: %d, Misses: %d' % (Method.F.Hits,Method.F.Misses))
     if 'Step' in Options.Repo.PermRequests:
-        print('Step Sum: %g' % sum(Results.PermStorage['Step']))
+        Steps = Results.PermStorage['Step']
+        if not isinstance(Steps,Reduction):
+            print('Step Sum: %g' % sum(Steps))
+        elif type(Steps.Policy) is ReduceSum:
+            print('Step Sum: %g' % Steps.Result())
     print('Min |X*|: %.3f' % np.min(np.abs(Results.TempStorage['Data'][-1])))
     print('Max |X*|: %.3f' % np.max(np.abs(Results.TempStorage['Data'][-1])))
+    if getattr(Results,'Profile',None) is not None:
+        PrintProfile(Results.Profile)
     print('------------------------------------------------------------------')
+
+
+def PrintProfile(Profile):
+    Total = Profile.Total()
+    for phase in sorted(Profile.Time,key=Profile.Time.get,reverse=True):
+        print('%s: %.3fs (%.1f%%), %d calls' %
+              (phase,Profile.Time[phase],100*Profile.Time[phase]/Total,
+               Profile.Calls[phase]))
+    if Profile.Allocations:
+        print('Allocations per Iteration: mean %.1f, max %d' %
+              (np.mean(Profile.Allocations),np.max(Profile.Allocations)))
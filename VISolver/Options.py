@@ -1,3 +1,5 @@
+import numpy as np
+
 
 class Initialization(object):
 
@@ -6,10 +8,23 @@ class Initialization(object):
 
 
 class Termination(object):
+    # Besides MaxIter and the (criteria,tol) pairs, runs can be capped by
+    # resources: WallTime seconds, MaxFEvals and MaxJacEvals (read from the
+    # solver's 'F Evaluations' and 'Jac Evaluations' counters) and MaxBytes
+    # recorded in PermStorage. Stalls lists criteria (e.g. Stagnation) that
+    # stop runs which are no longer making progress. IsTerminal sets
+    # Record.TerminatedBy to the name of the limit (e.g. 'WallTime') or stall
+    # criteria, or the (criteria,tol) criteria, that ended the run.
 
-    def __init__(self,MaxIter=1,Tols=[]):
+    def __init__(self,MaxIter=1,Tols=[],WallTime=None,MaxFEvals=None,
+                 MaxJacEvals=None,MaxBytes=None,Stalls=[]):
         self.Tols = [MaxIter]
         self.Tols.append(Tols)
+        self.WallTime = WallTime
+        self.MaxFEvals = MaxFEvals
+        self.MaxJacEvals = MaxJacEvals
+        self.MaxBytes = MaxBytes
+        self.Stalls = list(Stalls)
 
     def CheckTols(self,PermRequests,TempRequests):
         for tol in self.Tols[1]:
@@ -20,22 +35,319 @@ class Termination(object):
                       'during the descent.')
         return self.Tols
 
+    def CheckBudgets(self,TempRequests):
+        for budget, counter in [('MaxFEvals','F Evaluations'),
+                                ('MaxJacEvals','Jac Evaluations')]:
+            if getattr(self,budget) is not None and \
+                    counter not in TempRequests:
+                setattr(self,budget,None)
+                print(repr(budget), 'cannot be used as a terminal',
+                      'condition because', repr(counter), 'is not tracked',
+                      'during the descent.')
+
+    def CheckStalls(self,PermRequests,TempRequests):
+        for stall in list(self.Stalls):
+            Metric = getattr(stall,'Metric',None)
+            if Metric is not None and (Metric not in PermRequests) and \
+                    (Metric not in TempRequests):
+                self.Stalls.remove(stall)
+                print(repr(stall.Name), 'cannot be used as a terminal',
+                      'condition because its metric is not tracked',
+                      'during the descent.')
+
+    def Metrics(self):
+        return [stall.Metric for stall in self.Stalls
+                if hasattr(stall,'Metric')]
+
+    def Budget(self,Record):
+        if self.WallTime is not None and Record.Elapsed() >= self.WallTime:
+            return 'WallTime'
+        if self.MaxFEvals is not None and \
+                Record.TempStorage['F Evaluations'][-1] >= self.MaxFEvals:
+            return 'MaxFEvals'
+        if self.MaxJacEvals is not None and \
+                Record.TempStorage['Jac Evaluations'][-1] >= self.MaxJacEvals:
+            return 'MaxJacEvals'
+        if self.MaxBytes is not None and Record.PermBytes >= self.MaxBytes:
+            return 'MaxBytes'
+        return None
+
     def IsTerminal(self,Record):
         if Record.thisPermIndex >= self.Tols[0]:
+            Record.TerminatedBy = 'MaxIter'
             return True
         for tol in self.Tols[1]:
             if tol[0] in Record.TempStorage:
                 if Record.TempStorage[tol[0]][-1] <= tol[1]:
+                    Record.TerminatedBy = tol[0]
                     return True
-            elif Record.PermStorage[tol[0]][Record.thisPermIndex] <= tol[1]:
+            elif Record.Latest[tol[0]] <= tol[1]:
+                Record.TerminatedBy = tol[0]
+                return True
+        Record.TerminatedBy = self.Budget(Record)
+        if Record.TerminatedBy is not None:
+            return True
+        for stall, State in zip(self.Stalls,Record.Stalls):
+            if stall.IsTerminal(Record,State):
+                Record.TerminatedBy = stall.Name
                 return True
         return False
 
+    def TerminalLanes(self,Record):
+        Done = Record.Iterations >= self.Tols[0]
+        for tol in self.Tols[1]:
+            if tol[0] in Record.Batch:
+                Done |= Record.Batch[tol[0]] <= tol[1]
+            else:
+                Done |= Record.Latest[tol[0]] <= tol[1]
+        return Done
+
+
+def Current(Record,req):
+    if req in Record.TempStorage:
+        return Record.TempStorage[req][-1]
+    return Record.Latest[req]
+
+
+class Stagnation(object):
+    # Stall criteria watch a run for progress. Start returns the state kept
+    # for one run, which IsTerminal updates once per iteration.
+    # Stagnation stops once the iterate has moved less than Tol relative to
+    # its norm over Window iterations (checked every Window iterations).
+    Name = 'Stagnation'
+
+    def __init__(self,Tol=1e-10,Window=100,ord=None):
+        self.Tol = Tol
+        self.Window = Window
+        self.ord = ord
+
+    def Start(self,Method):
+        return {'Index': None, 'Data': None}
+
+    def IsTerminal(self,Record,State):
+        Index = Record.thisPermIndex
+        if State['Data'] is not None and Index-State['Index'] < self.Window:
+            return False
+        Data = np.ravel(Record.TempStorage['Data'][-1])
+        Stalled = False
+        if State['Data'] is not None:
+            Change = np.linalg.norm(Data-State['Data'],ord=self.ord)
+            Stalled = Change <= self.Tol*np.linalg.norm(Data,ord=self.ord)
+        State['Index'] = Index
+        State['Data'] = Data.copy()
+        return Stalled
+
+
+class StepPinned(object):
+    # Stops once the step has sat at MinStep or MaxStep (by default the
+    # solver's own bounds) for Count consecutive iterations.
+    Name = 'StepPinned'
+
+    def __init__(self,Count=100,MinStep=None,MaxStep=None):
+        self.Count = Count
+        self.MinStep = MinStep
+        self.MaxStep = MaxStep
+
+    def Start(self,Method):
+        MinStep = self.MinStep
+        if MinStep is None:
+            MinStep = getattr(Method,'MinStep',None)
+        MaxStep = self.MaxStep
+        if MaxStep is None:
+            MaxStep = getattr(Method,'MaxStep',None)
+        return {'MinStep': MinStep, 'MaxStep': MaxStep, 'Count': 0}
+
+    def IsTerminal(self,Record,State):
+        Step = Record.TempStorage['Step'][-1]
+        Pinned = ((State['MinStep'] is not None and
+                   Step <= State['MinStep']) or
+                  (State['MaxStep'] is not None and
+                   Step >= State['MaxStep']))
+        State['Count'] = State['Count'] + 1 if Pinned else 0
+        return State['Count'] >= self.Count
+
+
+class NoDecrease(object):
+    # Stops once Metric (tracked by the solver or requested in Reporting)
+    # has not fallen more than Tol, relative to its best value, below its
+    # best value for Window iterations.
+    Name = 'NoDecrease'
+
+    def __init__(self,Metric,Window=100,Tol=0.):
+        self.Metric = Metric
+        self.Window = Window
+        self.Tol = Tol
+
+    def Start(self,Method):
+        return {'Best': None, 'Index': 0}
+
+    def IsTerminal(self,Record,State):
+        Value = Current(Record,self.Metric)
+        Best = State['Best']
+        if Best is None or Value < Best - self.Tol*abs(Best):
+            State['Best'] = Value
+            State['Index'] = Record.thisPermIndex
+        return Record.thisPermIndex - State['Index'] >= self.Window
+
+
+class RecordAll(object):
+    # Recording policies decide which iterates of a request are kept in
+    # PermStorage. The starting and final values are always kept.
+    NeedsItem = False
+
+    def Due(self,Index,Item=None,Last=None):
+        return True
+
+    def Limit(self,MaxIter):
+        return int(MaxIter) + 1
+
+
+class RecordEvery(RecordAll):
+
+    def __init__(self,k):
+        assert k >= 1
+        self.k = k
+
+    def Due(self,Index,Item=None,Last=None):
+        return Index % self.k == 0
+
+    def Limit(self,MaxIter):
+        return int(MaxIter)//self.k + 2
+
+
+class RecordOnChange(RecordAll):
+    NeedsItem = True
+
+    def __init__(self,Tol,ord=None):
+        self.Tol = Tol
+        self.ord = ord
+
+    def Due(self,Index,Item=None,Last=None):
+        change = np.ravel(np.subtract(Item,Last))
+        return np.linalg.norm(change,ord=self.ord) > self.Tol
+
+
+class RecordFinal(RecordAll):
+
+    def Due(self,Index,Item=None,Last=None):
+        return False
+
+    def Limit(self,MaxIter):
+        return 2
+
+
+class RecordLogSpaced(RecordAll):
+
+    def __init__(self,PerDecade=10):
+        self.PerDecade = PerDecade
+
+    def Decade(self,Index):
+        return np.floor(self.PerDecade*np.log10(Index))
+
+    def Due(self,Index,Item=None,Last=None):
+        if Index <= 1:
+            return True
+        return self.Decade(Index) > self.Decade(Index-1)
+
+    def Limit(self,MaxIter):
+        return int(self.Decade(max(int(MaxIter),1))) + 3
+
+
+class Reducer(RecordAll):
+    # Reducers keep a constant-size running aggregate of a request in
+    # PermStorage (a Storage.Reduction) instead of its history. Start and
+    # Update fold the request's items into a state, Index being the number
+    # of items folded in so far, and Result reads the aggregate off it.
+
+    def Limit(self,MaxIter):
+        return 1
+
+    def Start(self,Item):
+        Item = np.asarray(Item)
+        return Item.astype(np.result_type(Item.dtype,np.float64))
+
+    def Result(self,State,Size):
+        return State
+
+
+class ReduceSum(Reducer):
+
+    def Update(self,State,Item,Index):
+        State += Item
+        return State
+
+
+class ReduceMean(ReduceSum):
+
+    def Result(self,State,Size):
+        return State/Size
+
+
+class ReduceMin(Reducer):
+
+    def Update(self,State,Item,Index):
+        return np.minimum(State,Item,out=State)
+
+
+class ReduceMax(Reducer):
+
+    def Update(self,State,Item,Index):
+        return np.maximum(State,Item,out=State)
+
+
+class ReduceLast(Reducer):
+    # Keeps the last K items, oldest first
+
+    def __init__(self,K=10):
+        self.K = K
+
+    def Start(self,Item):
+        Item = np.asarray(Item)
+        State = np.empty((self.K,)+Item.shape,dtype=Item.dtype)
+        State[0] = Item
+        return State
+
+    def Update(self,State,Item,Index):
+        State[Index % self.K] = Item
+        return State
+
+    def Result(self,State,Size):
+        Kept = min(Size,self.K)
+        return State[np.arange(Size-Kept,Size) % self.K]
+
+
+class ReduceHistogram(Reducer):
+    # Counts the (elements of the) items falling between consecutive Bins
+    # edges; the first and last counts are of values below Bins[0] and at
+    # or above Bins[-1]
+
+    def __init__(self,Bins):
+        self.Bins = np.asarray(Bins)
+
+    def Start(self,Item):
+        return self.Update(np.zeros(self.Bins.size+1,dtype=int),Item,0)
+
+    def Update(self,State,Item,Index):
+        Bin = np.searchsorted(self.Bins,np.ravel(Item),side='right')
+        State += np.bincount(Bin,minlength=State.size)
+        return State
+
 
 class Reporting(object):
 
-    def __init__(self,Requests=[]):
+    def __init__(self,Requests=[],Columnar=False,Policies=None,
+                 Directory=None,Deferred=[],Pool=None):
         self.PermRequests = Requests
+        self.Columnar = Columnar
+        self.Directory = Directory
+        self.Deferred = Deferred
+        self.Pool = Pool
+        if Policies is None:
+            Policies = {}
+        self.Policies = Policies
+
+    def Policy(self,req):
+        return self.Policies.get(req,RecordAll())
 
     def CheckRequests(self,Method,Domain):
         for req in self.PermRequests:
@@ -54,18 +366,69 @@ class Reporting(object):
 
 class Miscellaneous(object):
 
-    def __init__(self,Min=None):
+    def __init__(self,Min=None,Checkpoint=None,CheckpointEvery=1000):
         self.Min = Min
+        self.Checkpoint = Checkpoint
+        self.CheckpointEvery = CheckpointEvery
+
+    def CheckpointDue(self,Index):
+        return (self.Checkpoint is not None and
+                Index % self.CheckpointEvery == 0)
+
+
+class Precision(object):
+    # Runs are carried out in dtype: the starting point and the domain's
+    # floating-point arrays (see Domain.Astype) are cast to it for the
+    # duration of the solve and solvers keep their iterates and buffers in
+    # the precision of the starting point. dtype None leaves both as they
+    # are. Mixed-precision runs set Switch to a (criteria,tol) pair like
+    # those in Termination.Tols and continue in Final once criteria drops
+    # below tol, e.g. Precision(np.float32,(Domain.gap_simplex,1e-2)).
+
+    def __init__(self,dtype=None,Switch=None,Final=np.float64):
+        self.dtype = dtype
+        self.Switch = Switch
+        self.Final = Final
+
+    def CheckSwitch(self,PermRequests,TempRequests):
+        if self.Switch is not None and \
+                (self.Switch[0] not in PermRequests) and \
+                (self.Switch[0] not in TempRequests):
+            print(repr(self.Switch[0].func_name), 'cannot be used to switch',
+                  'precision because it is not tracked during the descent.')
+            self.Switch = None
+
+    def Cast(self,Start,Domain):
+        # Returns Start in dtype and the domain arrays replaced
+        if self.dtype is None:
+            return Start, {}
+        return Start.astype(self.dtype), Domain.Astype(self.dtype)
+
+    def SwitchDue(self,Record):
+        if self.Switch is None or Record.SwitchedAt is not None:
+            return False
+        return Current(Record,self.Switch[0]) < self.Switch[1]
+
+    def Finish(self,Record,Domain,Method,Originals):
+        # Continues in Final, from the domain's original arrays where they
+        # were cast down, and returns the domain arrays replaced
+        vars(Domain).update(Originals)
+        Originals = Domain.Astype(self.Final)
+        Method.SetPrecision(Record,self.Final)
+        if Record.SwitchedAt is None:
+            Record.SwitchedAt = Record.thisPermIndex
+        return Originals
 
 
 class DescentOptions(object):
 
     def __init__(self, Init=Initialization(), Term=Termination(),
-                 Repo=Reporting(), Misc=Miscellaneous()):
+                 Repo=Reporting(), Misc=Miscellaneous(), Prec=Precision()):
         self.Init = Init
         self.Term = Term
         self.Repo = Repo
         self.Misc = Misc
+        self.Prec = Prec
 
     def CheckOptions(self,Method,Domain):
         if self.Misc.Min is not None:
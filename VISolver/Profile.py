@@ -0,0 +1,148 @@
+import gc
+import sys
+import timeit
+
+
+def Blocks():
+    # Net allocations so far; garbage-collected objects where Python does
+    # not report allocated memory blocks
+    if hasattr(sys,'getallocatedblocks'):
+        return sys.getallocatedblocks()
+    return gc.get_count()[0]
+
+
+class Timer(object):
+    '''Callable wrapper charging the calls to Func to a phase of a Profile.
+
+    Compares and hashes like Func so it can stand in for a function used as
+    a TempStorage key (e.g. Method.F).
+    '''
+
+    def __init__(self,Func,Phase,Profile):
+        self.Func = Func
+        self.Phase = Phase
+        self.Profile = Profile
+
+    def __call__(self,*args,**kwargs):
+        self.Profile.Enter(self.Phase)
+        try:
+            return self.Func(*args,**kwargs)
+        finally:
+            self.Profile.Exit()
+
+    def __eq__(self,other):
+        if isinstance(other,Timer):
+            other = other.Func
+        return self.Func == other
+
+    def __ne__(self,other):
+        return not self == other
+
+    def __hash__(self):
+        return hash(self.Func)
+
+    def __getattr__(self,name):
+        return getattr(self.Func,name)
+
+
+class TimedProjection(object):
+    '''Stands in for a solver's projection while it is profiled.'''
+
+    def __init__(self,Proj,Profile):
+        self.Proj = Proj
+        self.P = Timer(Proj.P,'Projection',Profile)
+        self.P_Batch = Timer(Proj.P_Batch,'Projection',Profile)
+
+    def __getattr__(self,name):
+        return getattr(self.Proj,name)
+
+
+class Profile(object):
+    '''Breakdown of where a profiled Solve spent its time.
+
+    Time and Calls map each phase ('F', 'Jac', 'Projection', 'Update',
+    'BookKeeping' and 'Termination') to the seconds spent in and the number
+    of calls to it. Times are exclusive, e.g. the F evaluations and
+    projections made during an update are charged to 'F' and 'Projection'
+    rather than 'Update', so they sum to the total solve time. F evaluations
+    made by reporting requests count towards 'F' as well.
+
+    Allocations[k] is the net number of memory blocks allocated during
+    iteration k+1. Where Python does not report memory blocks (Python 2) it
+    is the net number of garbage-collected objects instead, and collection
+    is paused while profiling.
+    '''
+
+    def __init__(self):
+        self.Time = {}
+        self.Calls = {}
+        self.Allocations = []
+        self.Stack = []
+        self.Mark = None
+        self.Blocks = None
+        self.Originals = []
+        self.Collecting = None
+
+    def Enter(self,Phase):
+        now = timeit.default_timer()
+        if self.Stack:
+            self.Time[self.Stack[-1]] += now - self.Mark
+        if Phase not in self.Time:
+            self.Time[Phase] = 0.
+            self.Calls[Phase] = 0
+        self.Calls[Phase] += 1
+        self.Stack.append(Phase)
+        self.Mark = now
+
+    def Exit(self):
+        now = timeit.default_timer()
+        self.Time[self.Stack.pop()] += now - self.Mark
+        self.Mark = now
+
+    def Wrap(self,Func,Phase):
+        return Timer(Func,Phase,self)
+
+    def Replace(self,Object,name,Value):
+        self.Originals.append((Object,name,Object.__dict__.get(name)))
+        setattr(Object,name,Value)
+
+    def Attach(self,Domain,Method,Options):
+        # Time the solver's and the domain's F, the solver's Jacobian,
+        # projections and updates and the termination checks in place;
+        # Detach restores them
+        self.Replace(Method,'F',self.Wrap(Method.F,'F'))
+        self.Replace(Domain,'F',self.Wrap(Domain.F,'F'))
+        if hasattr(Method,'Jac'):
+            self.Replace(Method,'Jac',self.Wrap(Method.Jac,'Jac'))
+        self.Replace(Method,'Proj',TimedProjection(Method.Proj,self))
+        self.Replace(Method,'Update',self.Wrap(Method.Update,'Update'))
+        self.Replace(Options.Term,'IsTerminal',
+                     self.Wrap(Options.Term.IsTerminal,'Termination'))
+        if not hasattr(sys,'getallocatedblocks'):
+            self.Collecting = gc.isenabled()
+            gc.disable()
+        self.Blocks = Blocks()
+
+    def Observe(self,Record):
+        self.Replace(Record,'BookKeeping',
+                     self.Wrap(Record.BookKeeping,'BookKeeping'))
+        self.Replace(Record,'Finalize',
+                     self.Wrap(Record.Finalize,'BookKeeping'))
+
+    def Detach(self):
+        while self.Originals:
+            Object, name, Value = self.Originals.pop()
+            if Value is None:
+                delattr(Object,name)
+            else:
+                setattr(Object,name,Value)
+        if self.Collecting:
+            gc.enable()
+
+    def Iteration(self):
+        blocks = Blocks()
+        self.Allocations.append(blocks - self.Blocks)
+        self.Blocks = blocks
+
+    def Total(self):
+        return sum(self.Time.values())
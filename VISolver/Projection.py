@@ -3,33 +3,98 @@ import numpy as np
 from VISolver.Utilities import MachineLimit_Exp
 
 
+def Shift(Data,Step,Direc,out=None):
+    '''Returns Data+Step*Direc, computed in out when given.'''
+    if out is None:
+        return Data+Step*Direc
+    if out is Data:
+        out += Step*Direc
+        return out
+    np.multiply(Direc,Step,out=out)
+    np.add(Data,out,out=out)
+    return out
+
+
 class Projection(object):
 
+    # Whether P accepts an out= buffer
+    InPlace = False
+
+    # Whether P(Data) is the point of the feasible set nearest to Data, so
+    # that P can also pull points computed outside of the step (e.g. as
+    # combinations of iterates) back onto the set
+    Euclidean = True
+
     def P(self):
-        '''This function projects the data.'''
+        '''This function projects the data.
+
+        Projections with InPlace set take an optional out argument and write
+        the projected data into it (out may be Data itself) instead of
+        allocating a new array.
+        '''
         raise NotImplementedError(
             'Base classes of Projection must override the P method')
 
+    def P_Batch(self,Data,Step,Direc):
+        '''This function projects every row of the data using the step size
+        of that row. Projections that act row-wise on 2-D arrays override it.
+        '''
+        return np.array([self.P(d,s,g) for d,s,g in zip(Data,Step,Direc)])
+
+    def Active(self,Data,Step,Direc):
+        '''This function flags the components of the data that the
+        constraints hold in place when stepping along Direc, as opposed to
+        ones moving freely with it. Linearly implicit solvers only treat free
+        components implicitly; all components are flagged unless a
+        projection acts component-wise and overrides it.
+        '''
+        return np.ones(np.shape(Data),dtype=bool)
+
 
 class IdentityProjection(Projection):
 
-    def P(self,Data,Step=0.,Direc=0.):
-        return Data+Step*Direc
+    InPlace = True
+
+    def P(self,Data,Step=0.,Direc=0.,out=None):
+        return Shift(Data,Step,Direc,out)
+
+    def P_Batch(self,Data,Step,Direc):
+        return Data+Step[:,None]*Direc
+
+    def Active(self,Data,Step,Direc):
+        return np.zeros(np.shape(Data),dtype=bool)
 
 
 class EntropicProjection(Projection):
 
-    def P(self,Data,Step=0.,Direc=0.):
-        ProjectedData = Data*np.exp(MachineLimit_Exp(Step,Direc)*Direc)
-        return ProjectedData/np.sum(ProjectedData)
+    InPlace = True
+
+    Euclidean = False
+
+    def P(self,Data,Step=0.,Direc=0.,out=None):
+        Exponent = MachineLimit_Exp(Step,Direc)
+        if out is None:
+            ProjectedData = Data*np.exp(Exponent*Direc)
+            return ProjectedData/np.sum(ProjectedData,dtype=np.float64)
+        if out is Data:
+            out *= np.exp(Exponent*Direc)
+        else:
+            np.multiply(Direc,Exponent,out=out)
+            np.exp(out,out=out)
+            out *= Data
+        # Normalize with a double-precision sum for single-precision data
+        out /= np.sum(out,dtype=np.float64)
+        return out
 
 
 class EuclideanSimplexProjection(Projection):
 
+    InPlace = True
+
     # Taken from: https://gist.github.com/daien/1272551
-    def P(self,Data,Step=0.,Direc=0.,s=1):
+    def P(self,Data,Step=0.,Direc=0.,s=1,out=None):
         assert s > 0, "Radius s must be strictly positive (%d <= 0)" % s
-        Data = Data + Step*Direc
+        Data = Shift(Data,Step,Direc,out)
         n, = Data.shape  # will raise ValueError if Data is not 1-D
         # check if we are already on the simplex
         if Data.sum() == s and np.alltrue(Data >= 0):
@@ -43,33 +108,56 @@ class EuclideanSimplexProjection(Projection):
         # compute the Lagrange multiplier associated to the simplex constraint
         theta = (cssd[rho] - s) / (rho + 1.0)
         # compute the projection by thresholding Data using theta
-        w = (Data - theta).clip(min=0)
-        return w
+        Data -= theta
+        return Data.clip(min=0,out=Data)
 
 
 class NormBallProjection(Projection):
 
+    InPlace = True
+
     def __init__(self,p=2,axis=None):
         self.p = p
         self.axis = axis
 
-    def P(self,Data,Step=0.,Direc=0.):
-        un_norm = Data+Step*Direc
-        return un_norm/np.linalg.norm(un_norm,ord=self.p,axis=self.axis)
+    def P(self,Data,Step=0.,Direc=0.,out=None):
+        un_norm = Shift(Data,Step,Direc,out)
+        norm = np.linalg.norm(un_norm,ord=self.p,axis=self.axis)
+        if out is None:
+            return un_norm/norm
+        return np.divide(un_norm,norm,out=out)
+
+    def P_Batch(self,Data,Step,Direc):
+        if self.axis is not None:
+            return super(NormBallProjection,self).P_Batch(Data,Step,Direc)
+        un_norm = Data+Step[:,None]*Direc
+        return un_norm/np.linalg.norm(un_norm,ord=self.p,axis=1)[:,None]
 
 
 class BoxProjection(Projection):
 
+    InPlace = True
+
     def __init__(self,lo=-np.inf,hi=np.inf):
         self.min = lo
         self.max = hi
 
-    def P(self,Data,Step=0.,Direc=0.):
-        return np.clip(Data+Step*Direc,self.min,self.max)
+    def P(self,Data,Step=0.,Direc=0.,out=None):
+        return np.clip(Shift(Data,Step,Direc,out),self.min,self.max,out=out)
+
+    def P_Batch(self,Data,Step,Direc):
+        return np.clip(Data+Step[:,None]*Direc,self.min,self.max)
+
+    def Active(self,Data,Step,Direc):
+        _Data = Shift(Data,Step,Direc)
+        return (_Data < self.min) | (_Data > self.max)
 
 
 class HyperplaneProjection(Projection):
 
+    # Each call projects onto a single one of the hyperplanes
+    Euclidean = False
+
     def __init__(self,hyperplanes,sequence='random'):
         assert sequence in ['random','cyclic','distal']
         self.hyps = hyperplanes
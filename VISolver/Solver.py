@@ -1,9 +1,16 @@
 
-from VISolver.Storage import Storage
+import numpy as np
+
+from VISolver.Storage import Storage, BatchStorage, RingBuffer
+from VISolver.Profile import Profile
 
 
 class Solver(object):
 
+    # Whether the method requires a Euclidean projection (see
+    # Projection.Euclidean)
+    Euclidean = False
+
     def __init__(self):
 
         self.TempStorage = {'Data': ['?']}
@@ -21,9 +28,10 @@ class Solver(object):
 
     def BookKeeping(self,TempData):
 
-        for item in self.TempStorage:
-            self.TempStorage[item].pop(0)
-            self.TempStorage[item].append(TempData[item])
+        for item, history in self.TempStorage.items():
+            if type(history) is list:
+                history.pop(0)
+            history.append(TempData[item])
 
     def Update(self,Record):
 
@@ -37,8 +45,55 @@ class Solver(object):
 
         return self.TempStorage
 
-
-def Solve(Start,Method,Domain,Options):
+    def Workspace(self,Start,Count):
+        # Update buffers for Count arrays shaped like the iterates and in
+        # their precision (floating point at least)
+        return np.empty((Count,)+np.shape(Start),
+                        dtype=np.result_type(Start,np.float16))
+
+    def SetPrecision(self,Record,dtype):
+        # Mixed-precision runs continue in dtype: the floating-point items
+        # of TempStorage and the update buffers are converted
+        for item in Record.TempStorage.values():
+            if isinstance(item,RingBuffer):
+                item.Cast(dtype)
+        for name, value in list(vars(self).items()):
+            if isinstance(value,np.ndarray) and value.dtype.kind == 'f':
+                setattr(self,name,value.astype(dtype))
+
+    def Project(self,Data,Step,Direc,out):
+        # Projections supporting it write into the solver's preallocated
+        # buffer out rather than allocating a new array every update
+        if getattr(self.Proj,'InPlace',False):
+            return self.Proj.P(Data,Step,Direc,out=out)
+        return self.Proj.P(Data,Step,Direc)
+
+    def SetStep(self,Record,Step):
+        # Solvers deriving their step from InitStep (e.g. Euler) rescale
+        # their step size schedule to the new step
+        if hasattr(self,'InitStep'):
+            self.InitStep = Step
+        Record.TempStorage['Step'][-1] = Step
+
+    def State(self):
+        # Solver state kept outside TempStorage (e.g. factorizations or
+        # histories) that checkpoints must carry to continue a run exactly
+        return {}
+
+    def Restore(self,State):
+        # Reinstates the state returned by State when resuming a checkpoint
+        pass
+
+    def InitBatchStorage(self,Starts,Domain,Options):
+        raise NotImplementedError(
+            self.__class__.__name__+' does not support SolveBatch')
+
+    def BatchUpdate(self,Record):
+        raise NotImplementedError(
+            self.__class__.__name__+' does not support SolveBatch')
+
+
+def Solve(Start,Method,Domain,Options,resume=None,profile=False):
 
     #Record Data Dimension
     Domain.Dim = Start.size  # is this necessary?
@@ -46,16 +101,148 @@ def Solve(Start,Method,Domain,Options):
     #Check Validity of Options
     Options.CheckOptions(Method,Domain)
 
+    #Store Start and Domain in the Working Precision
+    Start, Originals = Options.Prec.Cast(Start,Domain)
+
+    #Time Each Phase of the Solve
+    Profiler = None
+    if profile:
+        Profiler = Profile()
+        Profiler.Attach(Domain,Method,Options)
+
+    try:
+        #Create Storage Object for Record Keeping
+        Record = Storage(Start,Domain,Method,Options)
+        if profile:
+            Profiler.Observe(Record)
+
+        #Continue From Checkpoint
+        if resume is not None:
+            Record.Resume(resume,Method)
+            if Record.SwitchedAt is not None:
+                Originals = Options.Prec.Finish(Record,Domain,Method,
+                                                Originals)
+
+        #Begin Solving
+        while not Options.Term.IsTerminal(Record):
+
+            #Compute New Data Using Update Method
+            TempStorage = Method.Update(Record)  # should also report projs
+
+            #Record Update Stats
+            Record.BookKeeping(TempStorage)
+            if profile:
+                Profiler.Iteration()
+
+            #Finish Mixed-Precision Runs in Full Precision
+            if Options.Prec.SwitchDue(Record):
+                Originals = Options.Prec.Finish(Record,Domain,Method,
+                                                Originals)
+
+            #Save Solver State
+            if Options.Misc.CheckpointDue(Record.thisPermIndex):
+                Record.Checkpoint(Options.Misc.Checkpoint,Method)
+
+        #Complete Thinned Records With Final Iterate
+        Record.Finalize()
+    finally:
+        if profile:
+            Profiler.Detach()
+        vars(Domain).update(Originals)
+
+    Record.Profile = Profiler
+
+    return Record
+
+
+def IterSolve(Start,Method,Domain,Options,resume=None):
+    '''Generator version of Solve that keeps the solver state between steps.
+
+    Yields the Record once initialized and again after every update until
+    the termination criteria are met, so callers can stream iterates and
+    metrics, or stop early, without rebuilding the solver. Sending a step
+    size sets the step used by the next update. The Record is finalized when
+    the generator finishes or is closed.
+    '''
+
+    #Record Data Dimension
+    Domain.Dim = Start.size
+
+    #Check Validity of Options
+    Options.CheckOptions(Method,Domain)
+
+    #Store Start and Domain in the Working Precision
+    Start, Originals = Options.Prec.Cast(Start,Domain)
+
     #Create Storage Object for Record Keeping
     Record = Storage(Start,Domain,Method,Options)
 
+    #Continue From Checkpoint
+    if resume is not None:
+        Record.Resume(resume,Method)
+        if Record.SwitchedAt is not None:
+            Originals = Options.Prec.Finish(Record,Domain,Method,Originals)
+
+    try:
+        Step = yield Record
+
+        #Begin Solving
+        while not Options.Term.IsTerminal(Record):
+
+            #Apply Step Size Sent by Caller
+            if Step is not None:
+                Method.SetStep(Record,Step)
+
+            #Compute New Data Using Update Method
+            TempStorage = Method.Update(Record)
+
+            #Record Update Stats
+            Record.BookKeeping(TempStorage)
+
+            #Finish Mixed-Precision Runs in Full Precision
+            if Options.Prec.SwitchDue(Record):
+                Originals = Options.Prec.Finish(Record,Domain,Method,
+                                                Originals)
+
+            #Save Solver State
+            if Options.Misc.CheckpointDue(Record.thisPermIndex):
+                Record.Checkpoint(Options.Misc.Checkpoint,Method)
+
+            Step = yield Record
+    finally:
+        #Complete Thinned Records With Final Iterate
+        Record.Finalize()
+        vars(Domain).update(Originals)
+
+
+def SolveBatch(Starts,Method,Domain,Options):
+    '''Solves the VI from every row of Starts in lock-step.
+
+    Each lane keeps its own step size and terminates on its own; terminated
+    lanes are compacted out of the batch so work shrinks as trajectories
+    converge. Only final values are recorded (see BatchStorage).
+    '''
+
+    #Record Data Dimension
+    Starts = np.atleast_2d(Starts)
+    Domain.Dim = Starts.shape[1]
+
+    #Check Validity of Options
+    Options.CheckOptions(Method,Domain)
+
+    #Create Storage Object for Record Keeping
+    Record = BatchStorage(Starts,Domain,Method,Options)
+
     #Begin Solving
-    while not Options.Term.IsTerminal(Record):
+    while Record.Lanes.size > 0:
+
+        #Compute New Data for Every Active Lane
+        Batch = Method.BatchUpdate(Record)
 
-        #Compute New Data Using Update Method
-        TempStorage = Method.Update(Record)  # should also report projections
+        #Record Update Stats and Retire Terminated Lanes
+        Record.BookKeeping(Batch)
 
-        #Record Update Stats
-        Record.BookKeeping(TempStorage)
+    #Evaluate Requests at Final Iterates
+    Record.Finalize()
 
     return Record
@@ -1,5 +1,8 @@
+import numpy as np
+
 from VISolver.Projection import IdentityProjection
 from VISolver.Solver import Solver
+from VISolver.Storage import RingBuffer
 
 
 class AG(Solver):
@@ -16,14 +19,18 @@ class AG(Solver):
 
     def InitTempStorage(self,Start,Domain,Options):
 
-        self.TempStorage['Data'] = self.StorageSize*[Start]
-        self.TempStorage['_Data'] = self.StorageSize*[Start]
-        self.TempStorage[self.F] = self.StorageSize*[self.F(Start)]
-        self.TempStorage['scount'] = self.StorageSize*[0]
-        self.TempStorage['s'] = self.StorageSize*[1]
-        self.TempStorage['Step'] = self.StorageSize*[Options.Init.Step]
-        self.TempStorage['F Evaluations'] = self.StorageSize*[1]
-        self.TempStorage['Projections'] = self.StorageSize*[0]
+        self.TempStorage['Data'] = RingBuffer(self.StorageSize,Start)
+        self.TempStorage['_Data'] = RingBuffer(self.StorageSize,Start)
+        self.TempStorage[self.F] = RingBuffer(self.StorageSize,self.F(Start))
+        self.TempStorage['scount'] = RingBuffer(self.StorageSize,0)
+        self.TempStorage['s'] = RingBuffer(self.StorageSize,1)
+        self.TempStorage['Step'] = RingBuffer(self.StorageSize,
+                                              Options.Init.Step)
+        self.TempStorage['F Evaluations'] = RingBuffer(self.StorageSize,1)
+        self.TempStorage['Projections'] = RingBuffer(self.StorageSize,0)
+
+        # Allocate Update Buffers
+        self.Buffers = self.Workspace(Start,2)
 
         self.InitStep = Options.Init.Step
 
@@ -53,9 +60,11 @@ class AG(Solver):
         TempData = {}
 
         # Perform Update
-        NewData = self.Proj.P(_Data,Step,F)
+        NewData = self.Project(_Data,Step,F,self.Buffers[0])
         ext = (Record.thisPermIndex-1)/(Record.thisPermIndex+2)
-        _NewData = NewData + ext*(NewData - Data)
+        _NewData = np.subtract(NewData,Data,out=self.Buffers[1])
+        _NewData *= ext
+        _NewData += NewData
 
         # Store Data
         TempData['Data'] = NewData
@@ -2,12 +2,14 @@ import numpy as np
 
 from VISolver.Projection import IdentityProjection
 from VISolver.Solver import Solver
+from VISolver.Storage import RingBuffer
+from VISolver.StepControl import GrowthControl
 
 
 class ABEuler(Solver):
 
     def __init__(self, Domain, P=IdentityProjection(), Delta0=1e-2,
-                 GrowthLimit=2, MinStep=-1e10, MaxStep=1e10):
+                 GrowthLimit=2, MinStep=-1e10, MaxStep=1e10, Control=None):
 
         self.F = Domain.F
 
@@ -25,13 +27,23 @@ class ABEuler(Solver):
 
         self.MaxStep = MaxStep
 
+        if Control is None:
+            Control = GrowthControl(Delta0,GrowthLimit)
+        self.Control = Control
+
     def InitTempStorage(self,Start,Domain,Options):
 
-        self.TempStorage['Data'] = self.StorageSize*[Start]
-        self.TempStorage[self.F] = self.StorageSize*[self.F(Start)]
-        self.TempStorage['Step'] = self.StorageSize*[Options.Init.Step]
-        self.TempStorage['F Evaluations'] = self.StorageSize*[1]
-        self.TempStorage['Projections'] = self.StorageSize*[0]
+        self.TempStorage['Data'] = RingBuffer(self.StorageSize,Start)
+        self.TempStorage[self.F] = RingBuffer(self.StorageSize,self.F(Start))
+        self.TempStorage['Step'] = RingBuffer(self.StorageSize,
+                                              Options.Init.Step)
+        self.TempStorage['Step Error'] = RingBuffer(self.StorageSize,1.)
+        self.TempStorage['F Evaluations'] = RingBuffer(self.StorageSize,1)
+        self.TempStorage['Projections'] = RingBuffer(self.StorageSize,0)
+        self.TempStorage['Rejected Steps'] = RingBuffer(self.StorageSize,0)
+
+        # Allocate Update Buffers
+        self.Buffers = self.Workspace(Start,3)
 
         return self.TempStorage
 
@@ -42,6 +54,8 @@ class ABEuler(Solver):
         # Retrieve Necessary Data
         Data = Record.TempStorage['Data'][-1]
         Step = Record.TempStorage['Step'][-1]
+        Error = Record.TempStorage['Step Error'][-1]
+        Rejects = 0
 
         # Initialize Storage
         TempData = {}
@@ -50,35 +64,48 @@ class ABEuler(Solver):
 
             # Perform Euler Update
             F = Record.TempStorage[self.F][-1]
-            NewData = self.Proj.P(Data,Step,F)
+            NewData = self.Project(Data,Step,F,self.Buffers[0])
 
             # Record Projections
             TempData['Projections'] = 1 + self.TempStorage['Projections'][-1]
 
         else:
 
-            # Perform Adams Bashforth Update
+            # Attempt Update Until Accepted, Adjusting Stepsize
             Fs = Record.TempStorage[self.F]
-            NewData = self.Proj.P(Data,Step,-0.5*Fs[-2]+1.5*Fs[-1])
-
-            # Perform Euler Update
-            _NewData = self.Proj.P(Data,Step,Fs[-1])
-
-            # Adjust Stepsize
-            Delta = max(abs(NewData-_NewData))
-            if Delta == 0:
-                growth = self.GrowthLimit
-            else:
-                growth = min((self.Delta0/Delta)**0.5, self.GrowthLimit)
-            Step = np.clip(growth*Step,self.MinStep,self.MaxStep)
+            LastError = Error
+            while True:
+
+                # Perform Adams Bashforth Update
+                direction = np.multiply(Fs[-2],-0.5,out=self.Buffers[2])
+                direction += np.multiply(Fs[-1],1.5,out=self.Buffers[1])
+                NewData = self.Project(Data,Step,direction,self.Buffers[0])
+
+                # Perform Euler Update
+                _NewData = self.Project(Data,Step,Fs[-1],self.Buffers[1])
+
+                # Adjust Stepsize
+                Error = self.Control.Error(Data,NewData,_NewData,
+                                           self.Buffers[2])
+                Accept = self.Control.Accept(Error) or \
+                    Rejects == self.Control.MaxRejects
+                Factor = self.Control.Factor(Error,LastError,1,Rejects > 0)
+                Step = np.clip(Factor*Step,self.MinStep,self.MaxStep)
+                if Accept:
+                    break
+                Rejects += 1
 
             # Record Projections
-            TempData['Projections'] = 2 + self.TempStorage['Projections'][-1]
+            TempData['Projections'] = 2*(Rejects+1) + \
+                self.TempStorage['Projections'][-1]
 
         # Store Data
         TempData['Data'] = NewData
         TempData[self.F] = self.F(NewData)
         TempData['Step'] = Step
+        TempData['Step Error'] = Error
         TempData['F Evaluations'] = 1 + self.TempStorage['F Evaluations'][-1]
+        TempData['Rejected Steps'] = Rejects + \
+            self.TempStorage['Rejected Steps'][-1]
         self.BookKeeping(TempData)
         return self.TempStorage
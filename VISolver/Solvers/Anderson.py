@@ -0,0 +1,138 @@
+import numpy as np
+
+from VISolver.Projection import IdentityProjection
+from VISolver.Solver import Solver
+from VISolver.Solvers.Euler import Euler
+
+
+class Anderson(Solver):
+    '''Anderson acceleration (type-II) of the iterates of another solver.
+
+    Method (by default Euler(Domain,P,FixStep=True)) is treated as a
+    fixed-point map g: every update runs Method.Update from the current
+    iterate x and replaces the resulting g(x) by g(x)-dG*gamma, where gamma
+    minimizes |f-dF*gamma| over the last Memory differences dF of residuals
+    f = g(x)-x and dG of the corresponding g(x). The differences are kept
+    as the rows of two Memory x Dim circular arrays. The accelerated point
+    is projected with the method's projection at zero step and costs one
+    extra F evaluation. The projection must be Euclidean: EntropicProjection
+    for one only rescales the point, leaving negative components in place.
+
+    As a safeguard, when an accelerated update is followed by a residual
+    larger than Safeguard times the one before, the memory is cleared and
+    the plain update g(x) is kept.
+    '''
+
+    Euclidean = True
+
+    def __init__(self, Domain, P=IdentityProjection(), Method=None,
+                 Memory=5, Safeguard=1., Rcond=1e-10):
+
+        if Method is None:
+            Method = Euler(Domain,P,FixStep=True)
+        if not getattr(Method.Proj,'Euclidean',True):
+            raise ValueError('Anderson requires a Euclidean projection, not '
+                             + Method.Proj.__class__.__name__)
+        self.Method = Method
+
+        self.F = Method.F
+
+        self.Proj = Method.Proj
+
+        self.StorageSize = Method.StorageSize
+
+        self.TempStorage = Method.TempStorage
+
+        self.Memory = Memory
+
+        self.Safeguard = Safeguard
+
+        self.Rcond = Rcond
+
+    def InitTempStorage(self,Start,Domain,Options):
+
+        self.TempStorage = self.Method.InitTempStorage(Start,Domain,Options)
+
+        # Allocate Circular Difference Arrays and Update Buffers
+        self.dF = self.Workspace(Start,self.Memory)
+        self.dG = self.Workspace(Start,self.Memory)
+        self.Buffers = self.Workspace(Start,3)
+        self.Count = 0
+        self.Head = 0
+        self.LastNorm = np.inf
+        self.Accelerated = False
+
+        return self.TempStorage
+
+    def State(self):
+        # The difference memory and the last residual and update it is
+        # built from, along with the wrapped method's own state
+        return {'dF': self.dF, 'dG': self.dG,
+                'LastF': self.Buffers[1], 'LastG': self.Buffers[2],
+                'Count': self.Count, 'Head': self.Head,
+                'LastNorm': self.LastNorm, 'Accelerated': self.Accelerated,
+                'Method': self.Method.State()}
+
+    def Restore(self,State):
+        self.dF = State['dF']
+        self.dG = State['dG']
+        self.Buffers[1] = State['LastF']
+        self.Buffers[2] = State['LastG']
+        self.Count = State['Count']
+        self.Head = State['Head']
+        self.LastNorm = State['LastNorm']
+        self.Accelerated = State['Accelerated']
+        self.Method.Restore(State['Method'])
+
+    def SetPrecision(self,Record,dtype):
+        super(Anderson,self).SetPrecision(Record,dtype)
+        self.Method.SetPrecision(Record,dtype)
+
+    def SetStep(self,Record,Step):
+        self.Method.SetStep(Record,Step)
+
+    def Update(self,Record):
+
+        # Retrieve Necessary Data
+        x = self.Buffers[0]
+        x[:] = Record.TempStorage['Data'][-1]
+        LastF, LastG = self.Buffers[1], self.Buffers[2]
+
+        # Perform Update of Underlying Method
+        self.Method.Update(Record)
+        g = Record.TempStorage['Data'][-1]
+        f = np.subtract(g,x,out=x)
+        Norm = np.linalg.norm(f)
+
+        # Record Differences, Restarting After Unsuccessful Accelerations
+        if self.Accelerated and Norm > self.Safeguard*self.LastNorm:
+            self.Count = 0
+        elif np.isfinite(self.LastNorm):
+            np.subtract(f,LastF,out=self.dF[self.Head])
+            np.subtract(g,LastG,out=self.dG[self.Head])
+            self.Head = (self.Head+1) % self.Memory
+            self.Count = min(self.Count+1,self.Memory)
+        LastF[:] = f
+        LastG[:] = g
+        self.LastNorm = Norm
+        self.Accelerated = False
+        if self.Count == 0:
+            return self.TempStorage
+
+        # Mix Past Iterates
+        dF, dG = self.dF[:self.Count], self.dG[:self.Count]
+        gamma = np.linalg.lstsq(dF.T,f,rcond=self.Rcond)[0]
+        NewData = self.Proj.P(g-np.dot(gamma,dG))
+        if not np.all(np.isfinite(NewData)):
+            return self.TempStorage
+
+        # Store Data
+        TempStorage = Record.TempStorage
+        TempStorage['Data'][-1] = NewData
+        TempStorage[self.F][-1] = self.F(NewData)
+        TempStorage['F Evaluations'][-1] = \
+            1 + TempStorage['F Evaluations'][-1]
+        TempStorage['Projections'][-1] = 1 + TempStorage['Projections'][-1]
+        self.Accelerated = True
+
+        return self.TempStorage
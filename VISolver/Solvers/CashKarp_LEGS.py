@@ -2,18 +2,22 @@ import numpy as np
 
 from VISolver.Projection import IdentityProjection
 from VISolver.Solver import Solver
+from VISolver.Storage import RingBuffer
 from VISolver.Utilities import GramSchmidt
 
 
 class CashKarp_LEGS(Solver):
 
     def __init__(self, Domain, P=IdentityProjection(), Delta0=1e-4,
-                 GrowthLimit=2, MinStep=-1e10, MaxStep=1e10):
+                 GrowthLimit=2, MinStep=-1e10, MaxStep=1e10, Modes=None):
 
         self.F = Domain.F
 
         self.Jac = Domain.Jac
 
+        # Track only the leading Modes Lyapunov exponents (all when None)
+        self.Modes = Modes
+
         self.Proj = P
 
         self.StorageSize = 1
@@ -40,19 +44,23 @@ class CashKarp_LEGS(Solver):
 
     def InitTempStorage(self,Start,Domain,Options):
 
-        self.TempStorage['Data'] = self.StorageSize*[Start]
-        self.TempStorage[self.F] = self.StorageSize*[self.F(Start)]
+        self.TempStorage['Data'] = RingBuffer(self.StorageSize,Start)
+        self.TempStorage[self.F] = RingBuffer(self.StorageSize,self.F(Start))
 
-        Psi_0 = np.eye(Start.size)
+        Psi_0 = np.eye(Start.size)[:,:self.Modes]
         dPsi_0 = np.dot(self.Jac(Start),Psi_0)
-        self.TempStorage['Psi'] = self.StorageSize*[Psi_0.flatten()]
-        self.TempStorage['dPsi'] = self.StorageSize*[dPsi_0.flatten()]
-        self.TempStorage['Lyapunov'] = self.StorageSize*[0*Start]
-        self.TempStorage['T'] = self.StorageSize*[0]
-
-        self.TempStorage['Step'] = self.StorageSize*[Options.Init.Step]
-        self.TempStorage['F Evaluations'] = self.StorageSize*[1]
-        self.TempStorage['Projections'] = self.StorageSize*[0]
+        self.TempStorage['Psi'] = RingBuffer(self.StorageSize,Psi_0.flatten())
+        self.TempStorage['dPsi'] = RingBuffer(self.StorageSize,
+                                              dPsi_0.flatten())
+        self.TempStorage['Lyapunov'] = RingBuffer(self.StorageSize,
+                                                  0*Start[:self.Modes])
+        self.TempStorage['T'] = RingBuffer(self.StorageSize,0)
+
+        self.TempStorage['Step'] = RingBuffer(self.StorageSize,
+                                              Options.Init.Step)
+        self.TempStorage['F Evaluations'] = RingBuffer(self.StorageSize,1)
+        self.TempStorage['Jac Evaluations'] = RingBuffer(self.StorageSize,1)
+        self.TempStorage['Projections'] = RingBuffer(self.StorageSize,0)
 
         return self.TempStorage
 
@@ -130,6 +138,8 @@ class CashKarp_LEGS(Solver):
         TempData['T'] = Tnew
         TempData['Step'] = Step
         TempData['F Evaluations'] = 6 + self.TempStorage['F Evaluations'][-1]
+        TempData['Jac Evaluations'] = \
+            6 + self.TempStorage['Jac Evaluations'][-1]
         TempData['Projections'] = 6 + self.TempStorage['Projections'][-1]
         self.BookKeeping(TempData)
 
@@ -2,6 +2,7 @@ import numpy as np
 
 from VISolver.Projection import IdentityProjection
 from VISolver.Solver import Solver
+from VISolver.Storage import RingBuffer
 
 
 class CashKarp_PhaseSpace(Solver):
@@ -37,11 +38,12 @@ class CashKarp_PhaseSpace(Solver):
 
     def InitTempStorage(self,Start,Domain,Options):
 
-        self.TempStorage['Data'] = self.StorageSize*[Start]
-        self.TempStorage[self.F] = self.StorageSize*[self.F(Start)]
-        self.TempStorage['Step'] = self.StorageSize*[Options.Init.Step]
-        self.TempStorage['F Evaluations'] = self.StorageSize*[1]
-        self.TempStorage['Projections'] = self.StorageSize*[0]
+        self.TempStorage['Data'] = RingBuffer(self.StorageSize,Start)
+        self.TempStorage[self.F] = RingBuffer(self.StorageSize,self.F(Start))
+        self.TempStorage['Step'] = RingBuffer(self.StorageSize,
+                                              Options.Init.Step)
+        self.TempStorage['F Evaluations'] = RingBuffer(self.StorageSize,1)
+        self.TempStorage['Projections'] = RingBuffer(self.StorageSize,0)
 
         return self.TempStorage
 
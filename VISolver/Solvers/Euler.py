@@ -1,5 +1,8 @@
+import numpy as np
+
 from VISolver.Projection import IdentityProjection
 from VISolver.Solver import Solver
+from VISolver.Storage import RingBuffer
 
 
 class Euler(Solver):
@@ -18,13 +21,14 @@ class Euler(Solver):
 
     def InitTempStorage(self,Start,Domain,Options):
 
-        self.TempStorage['Data'] = self.StorageSize*[Start]
-        self.TempStorage[self.F] = self.StorageSize*[self.F(Start)]
-        self.TempStorage['scount'] = self.StorageSize*[0]
-        self.TempStorage['s'] = self.StorageSize*[1]
-        self.TempStorage['Step'] = self.StorageSize*[Options.Init.Step]
-        self.TempStorage['F Evaluations'] = self.StorageSize*[1]
-        self.TempStorage['Projections'] = self.StorageSize*[0]
+        self.TempStorage['Data'] = RingBuffer(self.StorageSize,Start)
+        self.TempStorage[self.F] = RingBuffer(self.StorageSize,self.F(Start))
+        self.TempStorage['scount'] = RingBuffer(self.StorageSize,0)
+        self.TempStorage['s'] = RingBuffer(self.StorageSize,1)
+        self.TempStorage['Step'] = RingBuffer(self.StorageSize,
+                                              Options.Init.Step)
+        self.TempStorage['F Evaluations'] = RingBuffer(self.StorageSize,1)
+        self.TempStorage['Projections'] = RingBuffer(self.StorageSize,0)
 
         self.InitStep = Options.Init.Step
 
@@ -53,7 +57,7 @@ class Euler(Solver):
         TempData = {}
 
         # Perform Update
-        NewData = self.Proj.P(Data,Step,F)
+        NewData = self.Project(Data,Step,F,self.TempStorage['Data'].Next())
 
         # Store Data
         TempData['Data'] = NewData
@@ -65,3 +69,54 @@ class Euler(Solver):
         TempData['Projections'] = 1 + self.TempStorage['Projections'][-1]
         self.BookKeeping(TempData)
         return self.TempStorage
+
+    def InitBatchStorage(self,Starts,Domain,Options):
+
+        self.F_Batch = Domain.F_Batch
+        Lanes = Starts.shape[0]
+
+        Batch = {}
+        Batch['Data'] = np.array(Starts,dtype=float)
+        Batch[self.F] = self.F_Batch(Batch['Data'])
+        Batch['scount'] = np.zeros(Lanes,dtype=int)
+        Batch['s'] = np.ones(Lanes,dtype=int)
+        Batch['Step'] = Options.Init.Step*np.ones(Lanes)
+        Batch['F Evaluations'] = np.ones(Lanes,dtype=int)
+        Batch['Projections'] = np.zeros(Lanes,dtype=int)
+
+        self.InitStep = Options.Init.Step
+
+        return Batch
+
+    def BatchUpdate(self,Record):
+
+        # Retrieve Necessary Data
+        Data = Record.Batch['Data']
+        F = Record.Batch[self.F]
+        scount = Record.Batch['scount']
+        s = Record.Batch['s']
+
+        if self.FixStep:
+            Step = self.InitStep*np.ones(len(Data))
+        else:  # Use Decreasing Step Size Scheme
+            Reset = scount >= s
+            scount = np.where(Reset,0,scount) + 1
+            s = s + Reset
+            Step = self.InitStep/s
+
+        # Initialize Storage
+        Batch = {}
+
+        # Perform Update
+        NewData = self.Proj.P_Batch(Data,Step,F)
+
+        # Store Data
+        Batch['Data'] = NewData
+        Batch[self.F] = self.F_Batch(NewData)
+        Batch['scount'] = scount
+        Batch['s'] = s
+        Batch['Step'] = Step
+        Batch['F Evaluations'] = 1 + Record.Batch['F Evaluations']
+        Batch['Projections'] = 1 + Record.Batch['Projections']
+
+        return Batch
@@ -1,5 +1,8 @@
+import numpy as np
+
 from VISolver.Projection import IdentityProjection
 from VISolver.Solver import Solver
+from VISolver.Storage import RingBuffer
 
 
 class EG(Solver):
@@ -16,13 +19,17 @@ class EG(Solver):
 
     def InitTempStorage(self,Start,Domain,Options):
 
-        self.TempStorage['Data'] = self.StorageSize*[Start]
-        self.TempStorage[self.F] = self.StorageSize*[self.F(Start)]
-        self.TempStorage['scount'] = self.StorageSize*[0]
-        self.TempStorage['s'] = self.StorageSize*[1]
-        self.TempStorage['Step'] = self.StorageSize*[Options.Init.Step]
-        self.TempStorage['F Evaluations'] = self.StorageSize*[1]
-        self.TempStorage['Projections'] = self.StorageSize*[0]
+        self.TempStorage['Data'] = RingBuffer(self.StorageSize,Start)
+        self.TempStorage[self.F] = RingBuffer(self.StorageSize,self.F(Start))
+        self.TempStorage['scount'] = RingBuffer(self.StorageSize,0)
+        self.TempStorage['s'] = RingBuffer(self.StorageSize,1)
+        self.TempStorage['Step'] = RingBuffer(self.StorageSize,
+                                              Options.Init.Step)
+        self.TempStorage['F Evaluations'] = RingBuffer(self.StorageSize,1)
+        self.TempStorage['Projections'] = RingBuffer(self.StorageSize,0)
+
+        # Allocate Update Buffers
+        self.Buffers = self.Workspace(Start,1)
 
         self.InitStep = Options.Init.Step
 
@@ -49,8 +56,9 @@ class EG(Solver):
         TempData = {}
 
         # Perform Update
-        _NewData = self.Proj.P(Data,Step,F)
-        NewData = self.Proj.P(Data,Step,self.F(_NewData))
+        _NewData = self.Project(Data,Step,F,self.Buffers[0])
+        NewData = self.Project(Data,Step,self.F(_NewData),
+                               self.TempStorage['Data'].Next())
 
         # Store Data
         TempData['Data'] = NewData
@@ -0,0 +1,168 @@
+import numpy as np
+
+from VISolver.Projection import IdentityProjection
+from VISolver.Solver import Solver
+from VISolver.Storage import RingBuffer
+
+
+class FISTA(Solver):
+    '''Accelerated projected gradient method (FISTA, Beck & Teboulle [2009])
+    with backtracking and adaptive restart (O'Donoghue & Candes [2015]).
+
+    Every update steps from the extrapolated point _x with Step = -1/L
+    (+1/L when the initial step is positive, i.e. for domains whose F is the
+    negative gradient). L starts from Domain.L, or 1/|Init.Step| without
+    one, shrinks by Shrink before every update and grows by Eta until the
+    step passes the sufficient decrease test on Domain.f or, for domains
+    without f, the local Lipschitz test |F(x)-F(_x)| <= L*|x-_x|, which
+    costs an extra F evaluation per attempt. The momentum follows the
+    Scheinberg et al. [2014] rule for varying L. The objective at the
+    iterate is kept in TempStorage under Domain.f.
+
+    The momentum is reset whenever it stops helping: with Restart='Gradient'
+    when the new step points against the last one, with Restart='Function'
+    when Domain.f increases; None never restarts. Extrapolated points are
+    projected back onto the feasible set so F is only evaluated there, which
+    requires a Euclidean projection (e.g. not EntropicProjection).
+    '''
+
+    Euclidean = True
+
+    def __init__(self, Domain, P=IdentityProjection(), Restart='Gradient',
+                 Eta=2., Shrink=0.9):
+
+        if not getattr(P,'Euclidean',True):
+            raise ValueError('FISTA requires a Euclidean projection, not ' +
+                             P.__class__.__name__)
+
+        self.F = Domain.F
+
+        # Sufficient decrease requires the objective
+        self.f = getattr(Domain,'f',None)
+        if Restart == 'Function' and self.f is None:
+            raise ValueError('Function restarts require Domain.f')
+
+        self.Proj = P
+
+        self.StorageSize = 1
+
+        self.TempStorage = {}
+
+        self.Restart = Restart
+
+        self.Eta = Eta
+
+        self.Shrink = Shrink
+
+        self.L0 = getattr(Domain,'L',None)
+
+    def InitTempStorage(self,Start,Domain,Options):
+
+        # Descend along -F for negative steps and along F for positive ones
+        self.Sign = 1. if Options.Init.Step > 0 else -1.
+        L = self.L0
+        if L is None:
+            L = 1./abs(Options.Init.Step) if Options.Init.Step else 1.
+
+        self.TempStorage['Data'] = RingBuffer(self.StorageSize,Start)
+        self.TempStorage['_Data'] = RingBuffer(self.StorageSize,Start)
+        self.TempStorage[self.F] = RingBuffer(self.StorageSize,self.F(Start))
+        self.TempStorage['t'] = RingBuffer(self.StorageSize,1.)
+        self.TempStorage['Lipschitz'] = RingBuffer(self.StorageSize,L)
+        self.TempStorage['Step'] = RingBuffer(self.StorageSize,self.Sign/L)
+        if self.f is not None:
+            self.TempStorage[self.f] = RingBuffer(self.StorageSize,
+                                                  self.f(Start))
+        self.TempStorage['F Evaluations'] = RingBuffer(self.StorageSize,1)
+        self.TempStorage['Projections'] = RingBuffer(self.StorageSize,0)
+        self.TempStorage['Restarts'] = RingBuffer(self.StorageSize,0)
+
+        # Allocate Update Buffers
+        self.Buffers = self.Workspace(Start,3)
+
+        return self.TempStorage
+
+    # BookKeeping(self,TempData) defined in super class 'Solver'
+
+    def Sufficient(self,_Data,_F,_f,NewData,L):
+        # Whether 1/L passes the backtracking test, the F evaluations spent
+        # on it and the value it evaluated at NewData: f for domains with an
+        # objective (_f is f(_Data)), F otherwise
+        Diff = np.subtract(NewData,_Data,out=self.Buffers[2])
+        if self.f is not None:
+            Bound = _f - self.Sign*np.dot(_F,Diff) + 0.5*L*np.dot(Diff,Diff)
+            f = self.f(NewData)
+            return f <= Bound, 0, f
+        F = self.F(NewData)
+        dF = np.linalg.norm(F-_F)
+        return dF <= L*np.linalg.norm(Diff), 1, F
+
+    def Update(self,Record):
+
+        # Retrieve Necessary Data
+        Data = Record.TempStorage['Data'][-1]
+        _Data = Record.TempStorage['_Data'][-1]
+        _F = Record.TempStorage[self.F][-1]
+        t = Record.TempStorage['t'][-1]
+        LastL = Record.TempStorage['Lipschitz'][-1]
+
+        # Initialize Storage
+        TempData = {}
+        FEvals, Projections = 1, 1
+
+        # Backtrack From a Shrunken Lipschitz Estimate
+        _f = None if self.f is None else self.f(_Data)
+        L = self.Shrink*LastL
+        while True:
+            Step = self.Sign/L
+            NewData = self.Project(_Data,Step,_F,self.Buffers[0])
+            Accept, Evaluations, Value = self.Sufficient(_Data,_F,_f,
+                                                         NewData,L)
+            FEvals += Evaluations
+            if Accept:
+                break
+            L *= self.Eta
+            Projections += 1
+
+        # Reset Momentum When it Opposes Descent
+        if self.Restart == 'Gradient':
+            Restart = np.dot(_Data-NewData,NewData-Data) > 0
+        elif self.Restart == 'Function':
+            Restart = Value > Record.TempStorage[self.f][-1]
+        else:
+            Restart = False
+
+        # Extrapolate Along the Momentum
+        _NewF = None
+        if Restart:
+            NewT = 1.
+            _NewData = NewData
+            if self.f is None:
+                # F at the new iterate was evaluated by the backtracking test
+                _NewF = Value
+                FEvals -= 1
+        else:
+            NewT = 0.5*(1.+np.sqrt(1.+4.*t**2*L/LastL))
+            Momentum = np.subtract(NewData,Data,out=self.Buffers[1])
+            Momentum *= (t-1.)/NewT
+            Momentum += NewData
+            _NewData = self.Project(Momentum,0.,0.,Momentum)
+            Projections += 1
+
+        # Store Data
+        TempData['Data'] = NewData
+        TempData['_Data'] = _NewData
+        TempData[self.F] = self.F(_NewData) if _NewF is None else _NewF
+        if self.f is not None:
+            TempData[self.f] = Value
+        TempData['t'] = NewT
+        TempData['Lipschitz'] = L
+        TempData['Step'] = Step
+        TempData['F Evaluations'] = FEvals + \
+            self.TempStorage['F Evaluations'][-1]
+        TempData['Projections'] = Projections + \
+            self.TempStorage['Projections'][-1]
+        TempData['Restarts'] = Restart + self.TempStorage['Restarts'][-1]
+        self.BookKeeping(TempData)
+
+        return self.TempStorage
@@ -0,0 +1,97 @@
+import numpy as np
+
+from VISolver.Projection import IdentityProjection
+from VISolver.Solver import Solver
+from VISolver.Storage import RingBuffer
+
+
+class GoldenRatio(Solver):
+    '''Adaptive golden ratio algorithm (aGRAAL) of Malitsky [2019].
+
+    Every update steps from a running average _x of the iterates along F at
+    the current iterate,
+
+        _x_k = ((Phi-1)*x_k + _x_k-1)/Phi,  x_k+1 = P(_x_k + Step_k*F(x_k)),
+
+    costing a single F evaluation. The step needs no Lipschitz constant: it
+    grows by at most 1/Phi+1/Phi**2 per update and is otherwise bounded by
+    Phi*Theta/(4|Step_k-1|)*|x_k-x_k-1|**2/|F(x_k)-F(x_k-1)|**2, the local
+    inverse curvature of F, with Theta = Phi*Step_k-1/Step_k-2. Phi must lie
+    in (1,(1+sqrt(5))/2]; MaxStep caps the size of the step. Converges for
+    monotone, locally Lipschitz VIs.
+    '''
+
+    def __init__(self,Domain,P=IdentityProjection(),Phi=1.5,MaxStep=1e10):
+
+        self.F = Domain.F
+
+        self.Proj = P
+
+        self.StorageSize = 2
+
+        self.TempStorage = {}
+
+        self.Phi = Phi
+
+        self.MaxStep = MaxStep
+
+        self.Growth = 1./Phi + 1./Phi**2
+
+    def InitTempStorage(self,Start,Domain,Options):
+
+        self.TempStorage['Data'] = RingBuffer(self.StorageSize,Start)
+        self.TempStorage['_Data'] = RingBuffer(self.StorageSize,Start)
+        self.TempStorage[self.F] = RingBuffer(self.StorageSize,self.F(Start))
+        self.TempStorage['Theta'] = RingBuffer(self.StorageSize,1.)
+        self.TempStorage['Step'] = RingBuffer(self.StorageSize,
+                                              Options.Init.Step)
+        self.TempStorage['F Evaluations'] = RingBuffer(self.StorageSize,1)
+        self.TempStorage['Projections'] = RingBuffer(self.StorageSize,0)
+
+        # Allocate Update Buffers
+        self.Buffers = self.Workspace(Start,1)
+
+        return self.TempStorage
+
+    # BookKeeping(self,TempData) defined in super class 'Solver'
+
+    def Update(self,Record):
+
+        # Retrieve Necessary Data
+        Data = Record.TempStorage['Data']
+        Fs = Record.TempStorage[self.F]
+        _Data = Record.TempStorage['_Data'][-1]
+        Theta = Record.TempStorage['Theta'][-1]
+        Step = Record.TempStorage['Step'][-1]
+        Phi = self.Phi
+
+        # Adapt Stepsize to Local Curvature of F (none before the first step)
+        dX = np.linalg.norm(np.subtract(Data[-1],Data[-2],out=self.Buffers[0]))
+        dF = np.linalg.norm(np.subtract(Fs[-1],Fs[-2],out=self.Buffers[0]))
+        Size = min(self.Growth*abs(Step),self.MaxStep)
+        if dF > 0:
+            Size = min(Size,Phi*Theta/(4.*abs(Step))*(dX/dF)**2)
+        NewStep = np.copysign(Size,Step)
+
+        # Initialize Storage
+        TempData = {}
+
+        # Perform Update
+        _NewData = np.multiply(Data[-1],Phi-1.,
+                               out=self.TempStorage['_Data'].Next())
+        _NewData += _Data
+        _NewData /= Phi
+        NewData = self.Project(_NewData,NewStep,Fs[-1],
+                               self.TempStorage['Data'].Next())
+
+        # Store Data
+        TempData['Data'] = NewData
+        TempData['_Data'] = _NewData
+        TempData[self.F] = self.F(NewData)
+        TempData['Theta'] = Phi*Size/abs(Step)
+        TempData['Step'] = NewStep
+        TempData['F Evaluations'] = 1 + self.TempStorage['F Evaluations'][-1]
+        TempData['Projections'] = 1 + self.TempStorage['Projections'][-1]
+        self.BookKeeping(TempData)
+
+        return self.TempStorage
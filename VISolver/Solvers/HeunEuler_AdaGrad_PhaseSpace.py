@@ -2,6 +2,7 @@ import numpy as np
 
 from VISolver.Projection import IdentityProjection
 from VISolver.Solver import Solver
+from VISolver.Storage import RingBuffer
 
 
 class HeunEuler_AdaGrad_PhaseSpace(Solver):
@@ -32,14 +33,16 @@ class HeunEuler_AdaGrad_PhaseSpace(Solver):
         Step = Options.Init.Step
         F_Start = self.F(Start)
         F_Start_Norm = np.abs(F_Start)
-        self.TempStorage['Data'] = self.StorageSize*[Start]
-        self.TempStorage[self.F] = self.StorageSize*[np.sign(F_Start)]
-        self.TempStorage['Norms'] = self.StorageSize*[F_Start_Norm]
-        self.TempStorage['F_Norms'] = self.StorageSize*[F_Start_Norm/abs(Step)]
-        self.TempStorage['Step'] = self.StorageSize*[Step]
-        self.TempStorage['F Evaluations'] = self.StorageSize*[1]
-        self.TempStorage['Projections'] = self.StorageSize*[0]
-        self.TempStorage['Time'] = self.StorageSize*[0.]
+        self.TempStorage['Data'] = RingBuffer(self.StorageSize,Start)
+        self.TempStorage[self.F] = RingBuffer(self.StorageSize,
+                                              np.sign(F_Start))
+        self.TempStorage['Norms'] = RingBuffer(self.StorageSize,F_Start_Norm)
+        self.TempStorage['F_Norms'] = RingBuffer(self.StorageSize,
+                                                 F_Start_Norm/abs(Step))
+        self.TempStorage['Step'] = RingBuffer(self.StorageSize,Step)
+        self.TempStorage['F Evaluations'] = RingBuffer(self.StorageSize,1)
+        self.TempStorage['Projections'] = RingBuffer(self.StorageSize,0)
+        self.TempStorage['Time'] = RingBuffer(self.StorageSize,0.)
 
         return self.TempStorage
 
@@ -0,0 +1,92 @@
+import numpy as np
+
+from VISolver.Projection import IdentityProjection
+from VISolver.Solver import Solver
+from VISolver.Storage import RingBuffer
+
+
+class Popov(Solver):
+    '''Past extragradient (Popov [1980], optimistic gradient) solver.
+
+    Like the extragradient method every update extrapolates to _x and steps
+    from x along F(_x), but the extrapolation reuses F at the previous
+    extrapolated point instead of F(x):
+
+        _x_k = P(x_k + Step*F(_x_k-1)),  x_k+1 = P(x_k + Step*F(_x_k)),
+
+    so an update costs a single F evaluation where EG needs two. The F
+    kept in TempStorage is therefore F(_x) rather than F at the iterate.
+    Fixed steps converge for monotone Lipschitz VIs with |Step| < 1/(2L);
+    otherwise the step follows EG's decreasing scheme.
+    '''
+
+    def __init__(self,Domain,P=IdentityProjection(),FixStep=False):
+
+        self.F = Domain.F
+
+        self.Proj = P
+
+        self.FixStep = FixStep
+
+        self.StorageSize = 1
+
+        self.TempStorage = {}
+
+    def InitTempStorage(self,Start,Domain,Options):
+
+        self.TempStorage['Data'] = RingBuffer(self.StorageSize,Start)
+        self.TempStorage['_Data'] = RingBuffer(self.StorageSize,Start)
+        self.TempStorage[self.F] = RingBuffer(self.StorageSize,self.F(Start))
+        self.TempStorage['scount'] = RingBuffer(self.StorageSize,0)
+        self.TempStorage['s'] = RingBuffer(self.StorageSize,1)
+        self.TempStorage['Step'] = RingBuffer(self.StorageSize,
+                                              Options.Init.Step)
+        self.TempStorage['F Evaluations'] = RingBuffer(self.StorageSize,1)
+        self.TempStorage['Projections'] = RingBuffer(self.StorageSize,0)
+
+        # Allocate Update Buffers
+        self.Buffers = self.Workspace(Start,1)
+
+        self.InitStep = Options.Init.Step
+
+        return self.TempStorage
+
+    # BookKeeping(self,TempData) defined in super class 'Solver'
+
+    def Update(self,Record):
+
+        # Retrieve Necessary Data
+        Data = Record.TempStorage['Data'][-1]
+        F = Record.TempStorage[self.F][-1]
+        scount = self.TempStorage['scount'][-1]
+        s = self.TempStorage['s'][-1]
+
+        if self.FixStep:
+            Step = self.InitStep
+        else:  # Use Decreasing Step Size Scheme
+            if scount >= s:
+                scount = 0
+                s += 1
+            scount += 1
+            Step = self.InitStep/s
+
+        # Initialize Storage
+        TempData = {}
+
+        # Perform Update
+        _NewData = self.Project(Data,Step,F,self.Buffers[0])
+        _NewF = self.F(_NewData)
+        NewData = self.Project(Data,Step,_NewF,self.TempStorage['Data'].Next())
+
+        # Store Data
+        TempData['Data'] = NewData
+        TempData['_Data'] = _NewData
+        TempData[self.F] = _NewF
+        TempData['scount'] = scount
+        TempData['s'] = s
+        TempData['Step'] = Step
+        TempData['F Evaluations'] = 1 + self.TempStorage['F Evaluations'][-1]
+        TempData['Projections'] = 2 + self.TempStorage['Projections'][-1]
+        self.BookKeeping(TempData)
+
+        return self.TempStorage
@@ -0,0 +1,208 @@
+import numpy as np
+from scipy.linalg import lu_factor, lu_solve
+
+from VISolver.Projection import IdentityProjection
+from VISolver.Solver import Solver
+from VISolver.Storage import RingBuffer
+from VISolver.StepControl import GrowthControl
+
+
+class RosenbrockW(Solver):
+    '''Linearly implicit solver for stiff VIs: the two-stage Rosenbrock-W
+    method ROS2 of Verwer et al. [1999] with its embedded linearly implicit
+    Euler step driving the step size (see VISolver.StepControl).
+
+    Both stages solve linear systems with W = I-Gamma*Step*J, J being
+    Domain.Jac or, for domains without one, a forward difference Jacobian
+    costing Dim F evaluations. As a W-method ROS2 keeps its order with an
+    outdated J, so J is only re-evaluated every JacAge updates (or after a
+    rejected one) and the LU factorization of W is reused until the step
+    moves more than Refactor (relative) away from the one it was built for.
+
+    Only components the projection reports as free (see Projection.Active)
+    are treated implicitly, so that the solver's fixed points remain the
+    solutions of the VI; the others are stepped explicitly. Projections
+    acting on all components jointly (e.g. onto the simplex) leave every
+    component to explicit steps.
+    '''
+
+    def __init__(self, Domain, P=IdentityProjection(), Delta0=1e-2,
+                 GrowthLimit=2, MinStep=-1e10, MaxStep=1e10, Control=None,
+                 Refactor=0.2, JacAge=10):
+
+        self.F = Domain.F
+
+        # Fall back to forward differences without an analytical Jacobian
+        self.FiniteDifferences = not hasattr(Domain,'Jac')
+        if self.FiniteDifferences:
+            self.F_Batch = Domain.F_Batch
+            self.Jac = self.ForwardDifferenceJac
+        else:
+            self.Jac = Domain.Jac
+
+        self.Proj = P
+
+        self.StorageSize = 1
+
+        self.TempStorage = {}
+
+        self.Delta0 = Delta0
+
+        self.GrowthLimit = GrowthLimit
+
+        self.MinStep = MinStep
+
+        self.MaxStep = MaxStep
+
+        if Control is None:
+            Control = GrowthControl(Delta0,GrowthLimit)
+        self.Control = Control
+
+        self.Refactor = Refactor
+
+        self.JacAge = JacAge
+
+        # L-stable choice of ROS2's diagonal coefficient
+        self.Gamma = 1.+1./np.sqrt(2.)
+
+    def InitTempStorage(self,Start,Domain,Options):
+
+        self.TempStorage['Data'] = RingBuffer(self.StorageSize,Start)
+        self.TempStorage[self.F] = RingBuffer(self.StorageSize,self.F(Start))
+        self.TempStorage['Step'] = RingBuffer(self.StorageSize,
+                                              Options.Init.Step)
+        self.TempStorage['Step Error'] = RingBuffer(self.StorageSize,1.)
+        self.TempStorage['F Evaluations'] = RingBuffer(self.StorageSize,1)
+        self.TempStorage['Jac Evaluations'] = RingBuffer(self.StorageSize,0)
+        self.TempStorage['Projections'] = RingBuffer(self.StorageSize,0)
+        self.TempStorage['Rejected Steps'] = RingBuffer(self.StorageSize,0)
+
+        # Allocate Update Buffers
+        self.Buffers = self.Workspace(Start,3)
+
+        # Jacobian and factorization are built on the first update
+        self.J = None
+        self.LU = None
+        self.LUStep = None
+        self.LUFree = None
+        self.Age = 0
+
+        return self.TempStorage
+
+    # BookKeeping(self,TempData) defined in super class 'Solver'
+
+    def State(self):
+        # The Jacobian, its factorization and their ages set when the next
+        # updates refresh them, so checkpoints carry them
+        return dict((name,getattr(self,name))
+                    for name in ['J','LU','LUStep','LUFree','Age'])
+
+    def Restore(self,State):
+        vars(self).update(State)
+
+    def ForwardDifferenceJac(self,Data):
+        # Column j of the Jacobian from F at Data perturbed along e_j
+        Eps = np.sqrt(np.finfo(np.float64).eps)*np.maximum(1.,np.abs(Data))
+        Perturbed = Data+np.diag(Eps)
+        return ((self.F_Batch(Perturbed)-self.F(Data))/Eps[:,None]).T
+
+    def Factorize(self,Data,Step,Free):
+        # Refreshes J and the LU factorization of W, restricted to the free
+        # components, as needed and returns the F and Jacobian evaluations
+        # spent
+        Evaluations = (0,0)
+        if not np.any(Free):
+            return Evaluations
+        if self.J is None or self.Age >= self.JacAge:
+            self.J = np.asarray(self.Jac(Data))
+            self.Age = 0
+            self.LU = None
+            if self.FiniteDifferences:
+                Evaluations = (Data.size+1,0)
+            else:
+                Evaluations = (0,1)
+        if self.LU is None or not np.array_equal(Free,self.LUFree) or \
+                abs(Step-self.LUStep) > self.Refactor*abs(self.LUStep):
+            W = -self.Gamma*Step*self.J[np.ix_(Free,Free)]
+            W[np.diag_indices_from(W)] += 1.
+            self.LU = lu_factor(W,check_finite=False)
+            self.LUStep = Step
+            self.LUFree = Free
+        return Evaluations
+
+    def Solve(self,Direc,Free):
+        # Applies W^-1 to the free components of Direc in place
+        if np.any(Free):
+            Direc[Free] = lu_solve(self.LU,Direc[Free],check_finite=False)
+        return Direc
+
+    def Update(self,Record):
+
+        # Retrieve Necessary Data
+        Data = Record.TempStorage['Data'][-1]
+        F = Record.TempStorage[self.F][-1]
+        Step = Record.TempStorage['Step'][-1]
+        LastError = Record.TempStorage['Step Error'][-1]
+        Control = self.Control
+
+        # Initialize Storage
+        TempData = {}
+        FEvals, JacEvals, Rejects = 1, 0, 0
+
+        # Attempt Update Until Accepted, Adjusting Stepsize
+        while True:
+
+            # Components held by the constraints are stepped explicitly
+            Free = ~self.Proj.Active(Data,Step,F)
+            Evaluations = self.Factorize(Data,Step,Free)
+            FEvals += Evaluations[0]
+            JacEvals += Evaluations[1]
+
+            # Linearly implicit Euler stage (embedded solution)
+            k1 = self.Solve(np.array(F,dtype=self.Buffers.dtype),Free)
+            _NewData = self.Project(Data,Step,k1,self.Buffers[0])
+
+            # Second stage
+            k2 = self.F(_NewData)-2.*k1
+            FEvals += 1
+            self.Solve(k2,Free)
+            direction = np.multiply(k1,1.5,out=self.Buffers[2])
+            direction += 0.5*k2
+            NewData = self.Project(Data,Step,direction,self.Buffers[1])
+
+            # Filter the error estimate through W so stiff components, which
+            # both solutions damp, do not limit the step (Shampine [1982])
+            Diff = np.subtract(NewData,_NewData,out=self.Buffers[2])
+            _NewData = np.subtract(NewData,self.Solve(Diff,Free),
+                                   out=self.Buffers[0])
+
+            # Adjust Stepsize
+            Error = Control.Error(Data,NewData,_NewData,self.Buffers[2])
+            Accept = Control.Accept(Error) or Rejects == Control.MaxRejects
+            Factor = Control.Factor(Error,LastError,1,Rejects > 0)
+            Step = np.clip(Factor*Step,self.MinStep,self.MaxStep)
+            if Accept:
+                break
+            Rejects += 1
+
+            # Retry with a fresh Jacobian unless it was just evaluated
+            if self.Age > 0:
+                self.Age = self.JacAge
+        self.Age += 1
+
+        # Store Data
+        TempData['Data'] = NewData
+        TempData[self.F] = self.F(NewData)
+        TempData['Step'] = Step
+        TempData['Step Error'] = Error
+        TempData['F Evaluations'] = FEvals + \
+            self.TempStorage['F Evaluations'][-1]
+        TempData['Jac Evaluations'] = JacEvals + \
+            self.TempStorage['Jac Evaluations'][-1]
+        TempData['Projections'] = 2*(Rejects+1) + \
+            self.TempStorage['Projections'][-1]
+        TempData['Rejected Steps'] = Rejects + \
+            self.TempStorage['Rejected Steps'][-1]
+        self.BookKeeping(TempData)
+
+        return self.TempStorage
@@ -0,0 +1,328 @@
+import numpy as np
+
+from VISolver.Projection import IdentityProjection
+from VISolver.Solver import Solver
+from VISolver.Storage import RingBuffer
+from VISolver.StepControl import GrowthControl
+
+
+class Tableau(object):
+    '''Butcher tableau of an explicit embedded Runge-Kutta pair.
+
+    Row i of A combines the first i stages into the point where stage i is
+    evaluated (its first row is zero), b weights the stages into the
+    propagated solution and bhat into the embedded solution used to estimate
+    the error. Order is the order of the embedded solution, which sets how
+    strongly the step size responds to that estimate. When the last row of A
+    equals b (first same as last, FSAL) the last stage is F at the propagated
+    solution, so it doubles as the next step's first stage. When bhat
+    equals row i of A (e.g. Heun-Euler) the embedded solution is the point
+    stage i is evaluated at, which Embedded records.
+    '''
+
+    def __init__(self,A,b,bhat,Order):
+        self.A = np.array(A,dtype=float)
+        self.b = np.array(b,dtype=float)
+        self.bhat = np.array(bhat,dtype=float)
+        self.Order = Order
+        self.Stages = len(self.b)
+        self.FSAL = self.b[-1] == 0 and \
+            np.array_equal(self.A[-1,:-1],self.b[:-1])
+        self.Embedded = None
+        for i in xrange(1,self.Stages-self.FSAL):
+            if np.array_equal(self.A[i],self.bhat):
+                self.Embedded = i
+                break
+
+
+# Heun's method with an embedded Euler step
+HE21 = Tableau(A=[[0.,0.],
+                  [1.,0.]],
+               b=[1./2.,1./2.],
+               bhat=[1.,0.],
+               Order=1)
+
+# Bogacki-Shampine 3(2)
+BS32 = Tableau(A=[[0.,0.,0.,0.],
+                  [1./2.,0.,0.,0.],
+                  [0.,3./4.,0.,0.],
+                  [2./9.,1./3.,4./9.,0.]],
+               b=[2./9.,1./3.,4./9.,0.],
+               bhat=[7./24.,1./4.,1./3.,1./8.],
+               Order=2)
+
+# Cash-Karp 5(4)
+CK45 = Tableau(A=[[0.,0.,0.,0.,0.,0.],
+                  [1./5.,0.,0.,0.,0.,0.],
+                  [3./40.,9./40.,0.,0.,0.,0.],
+                  [3./10.,-9./10.,6./5.,0.,0.,0.],
+                  [-11./54.,5./2.,-70./27.,35./27.,0.,0.],
+                  [1631./55296.,175./512.,575./13824.,44275./110592.,
+                   253./4096.,0.]],
+               b=[37./378.,0.,250./621.,125./594.,0.,512./1771.],
+               bhat=[2825./27648.,0.,18575./48384.,13525./55296.,
+                     277./14336.,0.25],
+               Order=4)
+
+# Dormand-Prince 5(4)
+DP54 = Tableau(A=[[0.,0.,0.,0.,0.,0.,0.],
+                  [1./5.,0.,0.,0.,0.,0.,0.],
+                  [3./40.,9./40.,0.,0.,0.,0.,0.],
+                  [44./45.,-56./15.,32./9.,0.,0.,0.,0.],
+                  [19372./6561.,-25360./2187.,64448./6561.,-212./729.,
+                   0.,0.,0.],
+                  [9017./3168.,-355./33.,46732./5247.,49./176.,
+                   -5103./18656.,0.,0.],
+                  [35./384.,0.,500./1113.,125./192.,-2187./6784.,11./84.,
+                   0.]],
+               b=[35./384.,0.,500./1113.,125./192.,-2187./6784.,11./84.,0.],
+               bhat=[5179./57600.,0.,7571./16695.,393./640.,
+                     -92097./339200.,187./2100.,1./40.],
+               Order=4)
+
+
+class RungeKutta(Solver):
+    '''Adaptive explicit Runge-Kutta solver driven by a Tableau.
+
+    Every stage is projected like the step itself. Control (a StepControl,
+    by default GrowthControl(Delta0,GrowthLimit), which accepts every
+    update) judges each update from the gap between the propagated and
+    embedded solutions and resizes the step. An update costs
+    Tableau.Stages-1 F evaluations per attempt plus one for the F stored
+    at the new iterate, which FSAL tableaux get from their last stage: the
+    first stage is always the F stored from the previous update. Each
+    attempt projects every stage point, the propagated solution and,
+    unless it is a stage point (Tableau.Embedded), the embedded solution.
+    '''
+
+    def __init__(self, Domain, P=IdentityProjection(), Tableau=DP54,
+                 Delta0=1e-4, GrowthLimit=2, MinStep=-1e10, MaxStep=1e10,
+                 Control=None):
+
+        self.F = Domain.F
+
+        self.Proj = P
+
+        self.StorageSize = 1
+
+        self.TempStorage = {}
+
+        self.Tableau = Tableau
+
+        self.Delta0 = Delta0
+
+        self.GrowthLimit = GrowthLimit
+
+        self.MinStep = MinStep
+
+        self.MaxStep = MaxStep
+
+        if Control is None:
+            Control = GrowthControl(Delta0,GrowthLimit)
+        self.Control = Control
+
+    def InitTempStorage(self,Start,Domain,Options):
+
+        self.TempStorage['Data'] = RingBuffer(self.StorageSize,Start)
+        self.TempStorage[self.F] = RingBuffer(self.StorageSize,self.F(Start))
+        self.TempStorage['Step'] = RingBuffer(self.StorageSize,
+                                              Options.Init.Step)
+        self.TempStorage['Step Error'] = RingBuffer(self.StorageSize,1.)
+        self.TempStorage['F Evaluations'] = RingBuffer(self.StorageSize,1)
+        self.TempStorage['Projections'] = RingBuffer(self.StorageSize,0)
+        self.TempStorage['Rejected Steps'] = RingBuffer(self.StorageSize,0)
+
+        # Allocate Stage and Update Buffers
+        self.Ks = self.Workspace(Start,self.Tableau.Stages)
+        self.Buffers = self.Workspace(Start,3)
+
+        return self.TempStorage
+
+    # BookKeeping(self,TempData) defined in super class 'Solver'
+
+    def Attempt(self,Data,Step):
+        # Propagated and embedded solutions of one attempted update, with
+        # F at the former in the last stage of FSAL tableaux
+        A, b, bhat = self.Tableau.A, self.Tableau.b, self.Tableau.bhat
+        Embedded = self.Tableau.Embedded
+        Ks = self.Ks
+        direction = self.Buffers[0]
+
+        # The last stage of FSAL tableaux has no weight in the propagated
+        # solution, but still holds F from an earlier (possibly diverged)
+        # attempt and 0*nan is nan
+        if self.Tableau.FSAL:
+            Ks[-1,:] = 0.
+
+        # Calculate k values (gradients)
+        for i in xrange(1,self.Tableau.Stages-self.Tableau.FSAL):
+            np.einsum('i,i...', A[i,:i], Ks[:i], out=direction,
+                      casting='same_kind')
+            out = self.Buffers[2] if i == Embedded else self.Buffers[1]
+            _NewData = self.Project(Data, Step, direction, out)
+            Ks[i,:] = self.F(_NewData)
+            if i == Embedded:
+                _Embedded = _NewData
+
+        # Compute propagated solution (last stage of FSAL tableaux)
+        np.einsum('i,i...', b, Ks, out=direction, casting='same_kind')
+        NewData = self.Project(Data, Step, direction,
+                               self.TempStorage['Data'].Next())
+        if self.Tableau.FSAL:
+            Ks[-1,:] = self.F(NewData)
+
+        # Compute embedded solution (unless it is a stage point)
+        if Embedded is not None:
+            return NewData, _Embedded
+        np.einsum('i,i...', bhat, Ks, out=direction, casting='same_kind')
+        _NewData = self.Project(Data, Step, direction, self.Buffers[1])
+
+        return NewData, _NewData
+
+    def Update(self,Record):
+
+        # Retrieve Necessary Data
+        Data = Record.TempStorage['Data'][-1]
+        self.Ks[0,:] = Record.TempStorage[self.F][-1]
+        Step = Record.TempStorage['Step'][-1]
+        LastError = Record.TempStorage['Step Error'][-1]
+        Control, Order = self.Control, self.Tableau.Order
+
+        # Initialize Storage
+        TempData = {}
+
+        # Attempt Update Until Accepted, Adjusting Stepsize
+        Rejects = 0
+        while True:
+            NewData, _NewData = self.Attempt(Data,Step)
+            Error = Control.Error(Data,NewData,_NewData,self.Buffers[0])
+            Accept = Control.Accept(Error) or Rejects == Control.MaxRejects
+            Factor = Control.Factor(Error,LastError,Order,Rejects > 0)
+            Step = np.clip(Factor*Step,self.MinStep,self.MaxStep)
+            if Accept:
+                break
+            Rejects += 1
+
+        # Store Data
+        TempData['Data'] = NewData
+        if self.Tableau.FSAL:
+            TempData[self.F] = self.Ks[-1]
+        else:
+            TempData[self.F] = self.F(NewData)
+        TempData['Step'] = Step
+        TempData['Step Error'] = Error
+        TempData['F Evaluations'] = self.Evaluations(Rejects+1) + \
+            self.TempStorage['F Evaluations'][-1]
+        TempData['Projections'] = self.Projections(Rejects+1) + \
+            self.TempStorage['Projections'][-1]
+        TempData['Rejected Steps'] = Rejects + \
+            self.TempStorage['Rejected Steps'][-1]
+        self.BookKeeping(TempData)
+
+        return self.TempStorage
+
+    def Evaluations(self,Attempts):
+        # F evaluations of an update attempted Attempts times
+        return Attempts*(self.Tableau.Stages-1) + 1 - self.Tableau.FSAL
+
+    def Projections(self,Attempts):
+        # Projections of an update attempted Attempts times
+        Tableau = self.Tableau
+        return Attempts*(Tableau.Stages - Tableau.FSAL + 1 -
+                         (Tableau.Embedded is not None))
+
+    def InitBatchStorage(self,Starts,Domain,Options):
+
+        self.F_Batch = Domain.F_Batch
+        Lanes = Starts.shape[0]
+
+        Batch = {}
+        Batch['Data'] = np.array(Starts,dtype=float)
+        Batch[self.F] = self.F_Batch(Batch['Data'])
+        Batch['Step'] = Options.Init.Step*np.ones(Lanes)
+        Batch['Step Error'] = np.ones(Lanes)
+        Batch['F Evaluations'] = np.ones(Lanes,dtype=int)
+        Batch['Projections'] = np.zeros(Lanes,dtype=int)
+        Batch['Rejected Steps'] = np.zeros(Lanes,dtype=int)
+
+        return Batch
+
+    def BatchAttempt(self,Data,F,Step):
+        # Propagated and embedded solutions of one attempted update of every
+        # lane, and F at the former for FSAL tableaux
+        A, s = self.Tableau.A, self.Tableau.Stages
+        Embedded = self.Tableau.Embedded
+        Ks = np.zeros((s,)+Data.shape)
+        Ks[0] = F
+
+        # Calculate k values (gradients)
+        for i in xrange(1,s-self.Tableau.FSAL):
+            direction = np.einsum('i,i...', A[i,:i], Ks[:i])
+            _NewData = self.Proj.P_Batch(Data, Step, direction)
+            Ks[i] = self.F_Batch(_NewData)
+            if i == Embedded:
+                _Embedded = _NewData
+
+        # Compute propagated solution (last stage of FSAL tableaux)
+        direction = np.einsum('i,i...', self.Tableau.b, Ks)
+        NewData = self.Proj.P_Batch(Data, Step, direction)
+        if self.Tableau.FSAL:
+            Ks[-1] = self.F_Batch(NewData)
+
+        # Compute embedded solution (unless it is a stage point)
+        if Embedded is not None:
+            return NewData, _Embedded, Ks[-1]
+        direction = np.einsum('i,i...', self.Tableau.bhat, Ks)
+        _NewData = self.Proj.P_Batch(Data, Step, direction)
+
+        return NewData, _NewData, Ks[-1]
+
+    def BatchUpdate(self,Record):
+
+        # Retrieve Necessary Data
+        Data = Record.Batch['Data']
+        F = Record.Batch[self.F]
+        Step = Record.Batch['Step'].copy()
+        LastError = Record.Batch['Step Error']
+        Control, Order = self.Control, self.Tableau.Order
+
+        # Initialize Storage
+        Batch = {}
+        NewData = np.empty_like(Data)
+        NewF = np.empty_like(F)
+        Error = np.empty_like(LastError)
+        Rejects = np.zeros(Data.shape[0],dtype=int)
+
+        # Attempt Updates Until Accepted, Adjusting Stepsize of Each Lane
+        Lanes = np.arange(Data.shape[0])
+        while Lanes.size > 0:
+            _Data = Data[Lanes]
+            Next, _Next, _F = self.BatchAttempt(_Data,F[Lanes],Step[Lanes])
+            _Error = Control.Error(_Data,Next,_Next)
+            Accept = Control.Accept(_Error) | \
+                (Rejects[Lanes] == Control.MaxRejects)
+            Factor = Control.Factor(_Error,LastError[Lanes],Order,
+                                    Rejects[Lanes] > 0)
+            Step[Lanes] = np.clip(Factor*Step[Lanes],self.MinStep,
+                                  self.MaxStep)
+            Done = Lanes[Accept]
+            NewData[Done] = Next[Accept]
+            NewF[Done] = _F[Accept]
+            Error[Done] = _Error[Accept]
+            Lanes = Lanes[~Accept]
+            Rejects[Lanes] += 1
+        if not self.Tableau.FSAL:
+            NewF = self.F_Batch(NewData)
+
+        # Store Data
+        Batch['Data'] = NewData
+        Batch[self.F] = NewF
+        Batch['Step'] = Step
+        Batch['Step Error'] = Error
+        Batch['F Evaluations'] = self.Evaluations(Rejects+1) + \
+            Record.Batch['F Evaluations']
+        Batch['Projections'] = self.Projections(Rejects+1) + \
+            Record.Batch['Projections']
+        Batch['Rejected Steps'] = Rejects + Record.Batch['Rejected Steps']
+
+        return Batch
@@ -0,0 +1,111 @@
+import numpy as np
+
+
+class StepControl(object):
+    '''Step size control of the adaptive solvers.
+
+    After every attempted update the solver hands its propagated and
+    embedded solutions to Error, which sizes their difference, asks Accept
+    whether to keep the update and multiplies its step size by Factor. A
+    rejected update is retried from the same point with the new step, at
+    most MaxRejects times, after which it is accepted anyway. Every method
+    works on single iterates and on batches stacked along a leading axis.
+    '''
+
+    # Retries of a rejected update before it is accepted anyway
+    MaxRejects = 0
+
+    def Error(self,Data,NewData,_NewData,out=None):
+        '''Size of the embedded error estimate NewData-_NewData.'''
+        raise NotImplementedError(
+            'Base classes of StepControl must override the Error method')
+
+    def Accept(self,Error):
+        return np.ones(np.shape(Error),dtype=bool)
+
+    def Factor(self,Error,LastError,Order,Retried):
+        '''Factor the step size is multiplied by given the error of this
+        attempt, that of the last accepted update, the order of the
+        embedded solution and whether this update was already rejected.
+        '''
+        raise NotImplementedError(
+            'Base classes of StepControl must override the Factor method')
+
+
+class GrowthControl(StepControl):
+    '''Accepts every update and grows the next step by
+    (Delta0/Delta)**(1/(Order+1)), at most GrowthLimit, where Delta is the
+    largest difference between the two solutions.'''
+
+    def __init__(self,Delta0=1e-4,GrowthLimit=2):
+        self.Delta0 = Delta0
+        self.GrowthLimit = GrowthLimit
+
+    def Error(self,Data,NewData,_NewData,out=None):
+        Diff = np.subtract(NewData,_NewData,out=out)
+        return np.max(np.abs(Diff,out=Diff),axis=-1)
+
+    def Factor(self,Error,LastError,Order,Retried):
+        # Single iterates skip numpy's error state handling
+        if not isinstance(Error,np.ndarray):
+            if Error == 0:
+                return self.GrowthLimit
+            return min((self.Delta0/float(Error))**(1./(Order+1)),
+                       self.GrowthLimit)
+        with np.errstate(divide='ignore',over='ignore'):
+            return np.minimum((self.Delta0/Error)**(1./(Order+1)),
+                              self.GrowthLimit)
+
+
+class PIControl(StepControl):
+    '''Proportional-integral step size control with step rejection.
+
+    The error of an update is the largest component of
+    |NewData-_NewData|/(Abs+Rel*max(|Data|,|NewData|)) and updates with
+    errors above 1 are rejected. Accepted updates scale the step by
+    Safety*Error**(-Beta1/k)*LastError**(Beta2/k), with k the embedded
+    order plus one, rejected ones by Safety*Error**(-1/k); the factor is
+    kept within [MinFactor,MaxFactor] and may not exceed 1 on updates that
+    were already rejected.
+    '''
+
+    def __init__(self,Abs=1e-4,Rel=0.,Safety=0.9,MinFactor=0.2,MaxFactor=5.,
+                 Beta1=0.7,Beta2=0.4,MaxRejects=10):
+        self.Abs = Abs
+        self.Rel = Rel
+        self.Safety = Safety
+        self.MinFactor = MinFactor
+        self.MaxFactor = MaxFactor
+        self.Beta1 = Beta1
+        self.Beta2 = Beta2
+        self.MaxRejects = MaxRejects
+
+    def Error(self,Data,NewData,_NewData,out=None):
+        Diff = np.subtract(NewData,_NewData,out=out)
+        np.abs(Diff,out=Diff)
+        if self.Rel:
+            Scale = np.maximum(np.abs(Data),np.abs(NewData))
+            Scale *= self.Rel
+            Scale += self.Abs
+            Diff /= Scale
+        else:
+            Diff /= self.Abs
+        return np.max(Diff,axis=-1)
+
+    def Accept(self,Error):
+        return Error <= 1
+
+    def Factor(self,Error,LastError,Order,Retried):
+        k = Order+1.
+        # Errors that vanish would grow the step without bound (and ones
+        # that vanished in the past shrink it) before clipping
+        Error = np.maximum(Error,1e-10)
+        LastError = np.maximum(LastError,1e-4)
+        with np.errstate(invalid='ignore',over='ignore'):
+            Grow = self.Safety*Error**(-self.Beta1/k)*LastError**(self.Beta2/k)
+            Shrink = self.Safety*Error**(-1./k)
+        Factor = np.where(self.Accept(Error),Grow,Shrink)
+        Factor = np.clip(Factor,self.MinFactor,
+                         np.where(Retried,1.,self.MaxFactor))
+        # Diverged updates (nan errors) are retried with the smallest factor
+        return np.where(np.isnan(Factor),self.MinFactor,Factor)
@@ -1,3 +1,336 @@
+import os
+import tempfile
+import time
+from collections import deque
+from numbers import Integral
+try:
+    import cPickle as pickle
+except ImportError:
+    import pickle
+
+import numpy as np
+
+from VISolver.Options import RecordAll, Reducer
+
+
+def Dump(State,Path):
+    '''Pickles State to a temporary file which then replaces Path, so an
+    interrupted write never corrupts the last good checkpoint.'''
+    Directory = os.path.dirname(os.path.abspath(Path))
+    fd, Temp = tempfile.mkstemp(suffix='.tmp',dir=Directory)
+    with os.fdopen(fd,'wb') as File:
+        pickle.dump(State,File,pickle.HIGHEST_PROTOCOL)
+    if os.name == 'nt' and os.path.exists(Path):
+        os.remove(Path)
+    os.rename(Temp,Path)
+
+
+def Load(Path):
+    with open(Path,'rb') as File:
+        return pickle.load(File)
+
+
+def Bytes(Item):
+    # Size of the data held by one PermStorage item
+    if isinstance(Item,np.ndarray):
+        return Item.nbytes
+    return np.asarray(Item).nbytes
+
+
+class RingBuffer(deque):
+    '''Fixed-size history of one TempStorage item.
+
+    A deque bounded to Size items, so indexing follows list semantics ([-1]
+    is the most recent item and [-Size] the oldest) and appending discards
+    the oldest item, both at C speed. Array items get an ArrayRingBuffer
+    instead, which stores them in preallocated rows.
+    '''
+
+    def __new__(cls,Size,Item):
+        if cls is RingBuffer and np.ndim(Item) > 0:
+            cls = ArrayRingBuffer
+        return deque.__new__(cls)
+
+    def __init__(self,Size,Item):
+        deque.__init__(self,Size*[Item],Size)
+        self.Size = Size
+
+    def __reduce__(self):
+        return (RingBuffer,(self.Size,self[0]),list(self))
+
+    def __setstate__(self,Items):
+        for Item in Items:
+            self.append(Item)
+
+    def __copy__(self):
+        Copy = RingBuffer(self.Size,self[0])
+        Copy.__setstate__(list(self))
+        return Copy
+
+    def Cast(self,dtype):
+        # Converts the floating-point items held to dtype
+        Items = [np.dtype(dtype).type(x)
+                 if isinstance(x,(float,np.floating)) else x for x in self]
+        self.clear()
+        self.extend(Items)
+
+
+class ArrayRingBuffer(RingBuffer):
+    '''RingBuffer of array items held in the rows of one array.
+
+    Besides the Size rows in the history, a spare row is kept: Next() returns
+    it so a solver can compute the new item directly into it, in which case
+    append only rotates the rows, and any other item is copied into it.
+    Steady-state bookkeeping therefore performs no allocations. Items read
+    from the buffer are views and are overwritten once their row is reused;
+    copy them if they must outlive the next two updates.
+    '''
+
+    def __init__(self,Size,Item):
+        Item = np.asarray(Item)
+        self.Size = Size
+        self.Allocate(Item.dtype,Size*[Item])
+
+    def Allocate(self,dtype,Items):
+        Rows = np.empty((self.Size+1,)+np.shape(Items[0]),dtype=dtype)
+        Rows[:self.Size] = Items
+        deque.__init__(self,Rows[:self.Size],self.Size)
+        self.Buffer = Rows
+        self.Spare = Rows[self.Size]
+
+    def __setitem__(self,idx,Item):
+        self.Store(idx,Item)
+
+    def Next(self):
+        # The row the next item is appended in
+        return self.Spare
+
+    def append(self,Item):
+        if Item is not self.Spare:
+            if type(Item) is np.ndarray and Item.dtype is self.Buffer.dtype:
+                self.Spare[...] = Item
+            else:
+                self.Store(None,Item)
+        Row = self.Spare
+        self.Spare = self[0]
+        deque.append(self,Row)
+
+    def Store(self,idx,Item):
+        # Checked copy of Item into row idx (the spare row for None),
+        # widening the buffer if needed
+        Item = np.asarray(Item)
+        if Item.shape != self.Buffer.shape[1:]:
+            raise ValueError('Cannot store item of shape %r in RingBuffer '
+                             'of item shape %r' %
+                             (Item.shape,self.Buffer.shape[1:]))
+        if not np.can_cast(Item.dtype,self.Buffer.dtype):
+            dtype = np.result_type(self.Buffer.dtype,Item.dtype)
+            self.Allocate(dtype,list(self))
+        Row = self.Spare if idx is None else self[idx]
+        Row[...] = Item
+
+    def Cast(self,dtype):
+        if self.Buffer.dtype.kind == 'f':
+            self.Allocate(dtype,list(self))
+
+
+class Column(object):
+    '''Columnar history of one numeric PermStorage item.
+
+    Items are stacked into a single (iterations x item shape) ndarray whose
+    capacity grows geometrically (never past Limit rows when given), so
+    recording costs amortized O(1) and no per-item Python objects. Indexing,
+    iteration and np.asarray all operate on a zero-copy view of the rows
+    recorded so far.
+    '''
+
+    def __init__(self,Item,Capacity=1024,Limit=None):
+        Item = np.asarray(Item)
+        if Limit is not None:
+            Capacity = max(min(Capacity,Limit),1)
+        self.Limit = Limit
+        self.Size = 0
+        self.Data = np.empty((Capacity,)+Item.shape,dtype=Item.dtype)
+        self.append(Item)
+
+    @staticmethod
+    def Accepts(Item):
+        return np.asarray(Item).dtype.kind in 'biufc'
+
+    def view(self):
+        return self.Data[:self.Size]
+
+    def __array__(self,dtype=None):
+        if dtype is None:
+            return self.view()
+        return self.view().astype(dtype)
+
+    def __len__(self):
+        return self.Size
+
+    def __getitem__(self,idx):
+        return self.view()[idx]
+
+    def __iter__(self):
+        return iter(self.view())
+
+    def append(self,Item):
+        Item = np.asarray(Item)
+        if self.Size == self.Data.shape[0]:
+            self.Grow()
+        if not np.can_cast(Item.dtype,self.Data.dtype):
+            dtype = np.result_type(self.Data.dtype,Item.dtype)
+            self.Data = self.Data.astype(dtype)
+        self.Data[self.Size] = Item
+        self.Size += 1
+
+    def Grow(self):
+        Capacity = 2*self.Data.shape[0]
+        if self.Limit is not None and self.Size < self.Limit:
+            Capacity = min(Capacity,self.Limit)
+        Data = np.empty((Capacity,)+self.Data.shape[1:],dtype=self.Data.dtype)
+        Data[:self.Size] = self.Data[:self.Size]
+        self.Data = Data
+
+
+class DiskColumn(Column):
+    '''Append-only, disk-backed history of one numeric PermStorage item.
+
+    Items are buffered in a chunk of at most ChunkBytes which is appended to
+    a raw binary file in Directory whenever it fills, so memory use stays
+    constant however long the run. Indexing, iteration and np.asarray operate
+    on a read-only np.memmap of all rows recorded so far, which is reopened
+    only after new rows reach the file. Without a Directory the file is
+    scratch space in the system's temporary directory and is deleted by
+    Release once the run is over.
+    '''
+
+    def __init__(self,Item,Directory=None,Name='PermItem',ChunkBytes=2**20):
+        Item = np.asarray(Item)
+        Name = ''.join(c if c.isalnum() else '_' for c in Name)
+        fd, self.Path = tempfile.mkstemp(suffix='.bin',prefix=Name+'_',
+                                         dir=Directory)
+        os.close(fd)
+        self.Scratch = Directory is None
+        self.File = None
+        self.Map = None
+        self.Size = 0
+        self.Flushed = 0
+        Chunk = max(ChunkBytes//max(Item.nbytes,1),1)
+        self.Data = np.empty((Chunk,)+Item.shape,dtype=Item.dtype)
+        self.append(Item)
+
+    def view(self):
+        self.Flush()
+        if self.Map is None:
+            self.Map = np.memmap(self.Path,dtype=self.Data.dtype,mode='r',
+                                 shape=(self.Size,)+self.Data.shape[1:])
+        return self.Map
+
+    def __getitem__(self,idx):
+        # Serve recent rows from the pending chunk without touching the disk
+        Pending = self.Size - self.Flushed
+        if isinstance(idx,Integral) and -Pending <= idx < 0:
+            return self.Data[Pending+idx]
+        return self.view()[idx]
+
+    def append(self,Item):
+        Item = np.asarray(Item)
+        if not np.can_cast(Item.dtype,self.Data.dtype):
+            self.Promote(np.result_type(self.Data.dtype,Item.dtype))
+        if self.Size - self.Flushed == self.Data.shape[0]:
+            self.Flush()
+        self.Data[self.Size-self.Flushed] = Item
+        self.Size += 1
+
+    def Flush(self):
+        Pending = self.Size - self.Flushed
+        if Pending > 0:
+            if self.File is None:
+                self.File = open(self.Path,'ab')
+            self.File.write(self.Data[:Pending].tobytes())
+            self.File.flush()
+            self.Flushed = self.Size
+            self.Map = None
+
+    def Close(self):
+        self.Flush()
+        if self.File is not None:
+            self.File.close()
+            self.File = None
+
+    def Remove(self):
+        self.Close()
+        self.Map = None
+        os.remove(self.Path)
+
+    def Release(self):
+        # Closes the file at the end of a run, deleting scratch files; their
+        # records stay readable through the memory map (read into memory
+        # where open files cannot be deleted)
+        self.Close()
+        if self.Scratch and os.path.exists(self.Path):
+            Records = self.view()
+            if os.name == 'nt':
+                Records = np.array(Records)
+            self.Remove()
+            self.Map = Records
+
+    def Promote(self,dtype):
+        # Rewrite the file chunk by chunk with the wider dtype
+        self.Close()
+        Old = self.view()
+        self.Map = None
+        fd, Path = tempfile.mkstemp(suffix='.bin',
+                                    dir=os.path.dirname(self.Path))
+        with os.fdopen(fd,'wb') as File:
+            for start in range(0,self.Flushed,self.Data.shape[0]):
+                stop = start + self.Data.shape[0]
+                File.write(Old[start:stop].astype(dtype).tobytes())
+        del Old
+        os.rename(Path,self.Path)
+        self.Data = self.Data.astype(dtype)
+
+    def __getstate__(self):
+        self.Close()
+        State = self.__dict__.copy()
+        # Memory maps are reopened on demand, unless the file was released
+        State['Map'] = None
+        if not os.path.exists(self.Path):
+            State['Map'] = np.array(self.view())
+        return State
+
+
+class Reduction(object):
+    '''Constant-size running aggregate of one PermStorage item.
+
+    Stands in for the history of a request whose recording policy is a
+    Reducer (e.g. ReduceSum). Result() returns the aggregate, which
+    np.asarray and indexing also operate on, and len the number of items
+    reduced.
+    '''
+
+    def __init__(self,Policy,Item):
+        self.Policy = Policy
+        self.State = Policy.Start(Item)
+        self.Size = 1
+
+    def append(self,Item):
+        self.State = self.Policy.Update(self.State,Item,self.Size)
+        self.Size += 1
+
+    def Result(self):
+        return self.Policy.Result(self.State,self.Size)
+
+    def __array__(self,dtype=None):
+        return np.asarray(self.Result(),dtype=dtype)
+
+    def __len__(self):
+        return self.Size
+
+    def __getitem__(self,idx):
+        return self.Result()[idx]
+
 
 class Storage(object):
 
@@ -5,16 +338,93 @@ class Storage(object):
         self.thisTempIndex = 0
         self.maxTempIndex = Method.StorageSize
         self.thisPermIndex = 0
+        self.Profile = None
+        self.StartTime = time.time()
+        self.TerminatedBy = None
+        self.SwitchedAt = None
+        self.PermBytes = 0
 
         self.TempStorage = Method.InitTempStorage(Start,Domain,Options)
+        Options.Term.CheckBudgets(self.TempStorage)
+        Options.Term.CheckStalls(Options.Repo.PermRequests,self.TempStorage)
+        Options.Prec.CheckSwitch(Options.Repo.PermRequests,self.TempStorage)
+        self.Stalls = [stall.Start(Method) for stall in Options.Term.Stalls]
+
+        # Requests checked for termination are evaluated every iteration
+        self.Monitored = set(tol[0] for tol in Options.Term.Tols[1])
+        self.Monitored.update(Options.Term.Metrics())
+        if Options.Prec.Switch is not None:
+            self.Monitored.add(Options.Prec.Switch[0])
+
+        # Deferred requests are evaluated from the recorded Data after the run
+        self.Repo = Options.Repo
+        self.MaxIter = Options.Term.Tols[0]
+        self.Deferred = [req for req in Options.Repo.Deferred
+                         if req in Options.Repo.PermRequests and
+                         req not in self.Monitored and
+                         req not in Method.TempStorage]
+        Requests = list(Options.Repo.PermRequests)
+        if self.Deferred and 'Data' not in Requests:
+            Requests.append('Data')
 
         self.PermStorage = {}
-        for req in Options.Repo.PermRequests:
+        self.Policies = {}
+        self.PermIndices = {}
+        self.Latest = {}
+        for req in Requests:
+            if req in self.Deferred:
+                continue
+            self.Policies[req] = Options.Repo.Policy(req)
+            if type(self.Policies[req]) is not RecordAll and \
+                    not isinstance(self.Policies[req],Reducer):
+                self.PermIndices[req] = [0]
             if req in Method.TempStorage:
-                PermItem = Method.TempStorage[req][-1]
+                PermItem = self.Detach(Method.TempStorage[req][-1])
             else:
                 PermItem = req(Start)
-            self.PermStorage[req] = [PermItem]
+                self.Latest[req] = PermItem
+            self.PermStorage[req] = self.Allocate(req,PermItem)
+            if isinstance(self.PermStorage[req],Reduction):
+                PermItem = self.PermStorage[req].State
+            self.PermBytes += Bytes(PermItem)
+
+    def Elapsed(self):
+        return time.time() - self.StartTime
+
+    def Allocate(self,req,PermItem):
+        Policy = self.Repo.Policy(req)
+        if isinstance(Policy,Reducer):
+            return Reduction(Policy,PermItem)
+        if self.Repo.Directory is not None and Column.Accepts(PermItem):
+            Name = req if isinstance(req,str) else req.__name__
+            return DiskColumn(PermItem,self.Repo.Directory,Name=Name)
+        elif self.Repo.Columnar and Column.Accepts(PermItem):
+            Limit = Policy.Limit(self.MaxIter)
+            return Column(PermItem,Limit=Limit)
+        return [PermItem]
+
+    def Detach(self,Item):
+        # TempStorage items may be views into a RingBuffer slot
+        if isinstance(Item,np.ndarray):
+            return Item.copy()
+        return Item
+
+    def Retrieve(self,req,NewData):
+        if req in self.TempStorage:
+            return self.TempStorage[req][-1]
+        PermItem = req(NewData)
+        self.Latest[req] = PermItem
+        return PermItem
+
+    def Record(self,req,PermItem):
+        History = self.PermStorage[req]
+        if isinstance(History,list):
+            PermItem = self.Detach(PermItem)
+        History.append(PermItem)
+        if not isinstance(History,Reduction):
+            self.PermBytes += Bytes(PermItem)
+        if req in self.PermIndices:
+            self.PermIndices[req].append(self.thisPermIndex)
 
     def BookKeeping(self,TempStorage):
 
@@ -27,8 +437,194 @@ class Storage(object):
         # Update PermStorage
         self.thisPermIndex += 1
         for req in self.PermStorage:
+            Policy = self.Policies[req]
+            Due = Policy.NeedsItem or Policy.Due(self.thisPermIndex)
+            if not (Due or req in self.Monitored):
+                continue
+            PermItem = self.Retrieve(req,NewData)
+            if Policy.NeedsItem:
+                Last = self.PermStorage[req][-1]
+                Due = Policy.Due(self.thisPermIndex,PermItem,Last)
+            if Due:
+                self.Record(req,PermItem)
+
+    def Finalize(self):
+
+        # Thinned requests always end with the final iterate
+        NewData = self.TempStorage['Data'][-1]
+        for req in self.PermIndices:
+            if self.PermIndices[req][-1] < self.thisPermIndex:
+                self.Record(req,self.Retrieve(req,NewData))
+
+        # Evaluate deferred requests at every recorded iterate, all at once
+        # when the domain vectorizes the request (e.g. F_Batch)
+        for req in self.Deferred:
+            Data = self.PermStorage['Data']
+            Batch = self.Batch(req)
+            if Batch is not None:
+                PermItems = Batch(np.asarray(Data))
+            elif self.Repo.Pool is None:
+                PermItems = [req(x) for x in Data]
+            else:
+                PermItems = self.Repo.Pool.map(req,Data)
+            History = self.Allocate(req,PermItems[0])
+            for PermItem in PermItems[1:]:
+                History.append(PermItem)
+            self.PermStorage[req] = History
+            if 'Data' in self.PermIndices:
+                self.PermIndices[req] = list(self.PermIndices['Data'])
+
+        # Release disk-backed records
+        for req in self.PermStorage:
+            if isinstance(self.PermStorage[req],DiskColumn):
+                self.PermStorage[req].Release()
+
+    @staticmethod
+    def Batch(req):
+        # The batch form of a domain function, e.g. Domain.F_Batch for
+        # Domain.F, if the domain provides one
+        Domain = getattr(req,'__self__',None)
+        if Domain is None:
+            return None
+        return getattr(Domain,req.__name__+'_Batch',None)
+
+    @staticmethod
+    def Key(req):
+        # Domain functions are keyed by name so checkpoints can be matched
+        # against the bound methods of a freshly constructed solver
+        if isinstance(req,str):
+            return req
+        return '<'+req.__name__+'>'
+
+    def Checkpoint(self,Path,Method=None):
+        '''Saves everything needed to continue the run to Path.
+
+        The solver's TempStorage, the iteration counter, the recorded history,
+        the state of the stall criteria and numpy's global random state are
+        written with Dump, together with Method.State() when the solver is
+        given.
+        '''
+        State = {}
+        State['thisPermIndex'] = self.thisPermIndex
+        State['PermBytes'] = self.PermBytes
+        State['SwitchedAt'] = self.SwitchedAt
+        State['TempStorage'] = dict((self.Key(key),self.TempStorage[key])
+                                    for key in self.TempStorage)
+        State['PermStorage'] = {}
+        for req in self.PermStorage:
+            History = self.PermStorage[req]
+            if isinstance(History,Column):
+                History = np.array(History)
+            State['PermStorage'][self.Key(req)] = History
+        State['PermIndices'] = dict((self.Key(req),self.PermIndices[req])
+                                    for req in self.PermIndices)
+        State['Latest'] = dict((self.Key(req),self.Latest[req])
+                               for req in self.Latest)
+        State['Stalls'] = self.Stalls
+        State['Random'] = np.random.get_state()
+        if Method is not None:
+            State['Method'] = Method.State()
+        Dump(State,Path)
+
+    def Resume(self,Path,Method=None):
+        '''Restores the state saved by Checkpoint so the run continues
+        exactly where it left off, passing the solver's own state to
+        Method.Restore when the solver is given.'''
+        State = Load(Path)
+
+        self.thisPermIndex = State['thisPermIndex']
+        self.PermBytes = State['PermBytes']
+        self.SwitchedAt = State['SwitchedAt']
+        for key in self.TempStorage:
+            self.TempStorage[key] = State['TempStorage'][self.Key(key)]
+        for req in self.PermStorage:
+            Items = State['PermStorage'][self.Key(req)]
+            if isinstance(Items,Reduction):
+                self.PermStorage[req] = Items
+                continue
+            if isinstance(self.PermStorage[req],DiskColumn):
+                self.PermStorage[req].Remove()
+            History = self.Allocate(req,Items[0])
+            for PermItem in Items[1:]:
+                History.append(PermItem)
+            self.PermStorage[req] = History
+        for req in self.PermIndices:
+            self.PermIndices[req] = State['PermIndices'][self.Key(req)]
+        for req in self.Latest:
+            self.Latest[req] = State['Latest'][self.Key(req)]
+        self.Stalls = State['Stalls']
+        np.random.set_state(State['Random'])
+        if Method is not None and 'Method' in State:
+            Method.Restore(State['Method'])
+
+
+class BatchStorage(object):
+    '''Lock-step record of many trajectories solved by SolveBatch.
+
+    Batch holds the current state of the lanes still running, each item
+    stacked along a leading lane axis, and Lanes maps those rows back to rows
+    of Starts. Lanes are retired (and Batch compacted) as soon as they
+    terminate, after which only their final values are kept:
+    TempStorage[key][i] and PermStorage[req][i] are lane i's final values and
+    thisPermIndex[i] its iteration count.
+    '''
+
+    def __init__(self,Starts,Domain,Method,Options):
+        self.Term = Options.Term
+        self.Requests = Options.Repo.PermRequests
+
+        self.Batch = Method.InitBatchStorage(Starts,Domain,Options)
+        self.Lanes = np.arange(Starts.shape[0])
+        self.Iterations = np.zeros(Starts.shape[0],dtype=int)
+
+        self.TempStorage = {}
+        for key in self.Batch:
+            self.TempStorage[key] = np.empty_like(self.Batch[key])
+        self.thisPermIndex = np.zeros(Starts.shape[0],dtype=int)
+        self.PermStorage = {}
+
+        # Requests checked for termination are evaluated every iteration
+        self.Monitored = [tol[0] for tol in Options.Term.Tols[1]
+                          if tol[0] not in self.Batch]
+        self.Latest = {}
+        self.Evaluate()
+        self.Retire(self.Term.TerminalLanes(self))
+
+    def Evaluate(self):
+        for req in self.Monitored:
+            self.Latest[req] = np.array([req(x) for x in self.Batch['Data']])
+
+    def BookKeeping(self,Batch):
+
+        # Update Lanes
+        self.Batch = Batch
+        self.Iterations += 1
+        self.Evaluate()
+
+        # Retire Terminated Lanes
+        Done = self.Term.TerminalLanes(self)
+        if np.any(Done):
+            self.Retire(Done)
+
+    def Retire(self,Done):
+        Lanes = self.Lanes[Done]
+        for key in self.Batch:
+            self.TempStorage[key][Lanes] = self.Batch[key][Done]
+        self.thisPermIndex[Lanes] = self.Iterations[Done]
+
+        # Compact Remaining Lanes
+        Keep = ~Done
+        self.Lanes = self.Lanes[Keep]
+        self.Iterations = self.Iterations[Keep]
+        for key in self.Batch:
+            self.Batch[key] = self.Batch[key][Keep]
+        for req in self.Latest:
+            self.Latest[req] = self.Latest[req][Keep]
+
+    def Finalize(self):
+        for req in self.Requests:
             if req in self.TempStorage:
-                PermItem = self.TempStorage[req][-1]
+                self.PermStorage[req] = self.TempStorage[req]
             else:
-                PermItem = req(NewData)
-            self.PermStorage[req].append(PermItem)
+                self.PermStorage[req] = np.array(
+                    [req(x) for x in self.TempStorage['Data']])
@@ -0,0 +1,240 @@
+from __future__ import print_function
+import itertools
+import multiprocessing as mp
+import os
+import tempfile
+import time
+import traceback
+from numbers import Number
+
+import numpy as np
+
+from VISolver.Options import Current
+from VISolver.Solver import Solve
+
+
+def Grid(Params):
+    '''Expands {name: values} into every combination of one value per name.
+
+    values may be a list, or a dict mapping labels to values for parameters
+    (e.g. projections) whose values have no stable printable form.
+    '''
+    names = sorted(Params)
+    for values in itertools.product(*[Labelled(Params[n]) for n in names]):
+        yield [(n,label,value) for n, (label,value) in zip(names,values)]
+
+
+def Labelled(Values):
+    if isinstance(Values,dict):
+        return sorted(Values.items())
+    return [(Label(value),value) for value in Values]
+
+
+def Label(Value):
+    if Value is None or isinstance(Value,(Number,str,bool,tuple)):
+        return repr(Value)
+    return Value.__class__.__name__
+
+
+def Name(Value):
+    if Value is None or isinstance(Value,str):
+        return Value
+    return getattr(Value,'__name__',repr(Value))
+
+
+class Task(object):
+    '''One Solve of a sweep: a domain, method and options configuration.
+
+    Each of Domain, Method and Options is a (Name,Factory,Params) entry with
+    Params the chosen (name,label,value) triples. The domain is built as
+    Factory(**Params), the method as Factory(Domain=Domain,**Params) and the
+    options as Factory(Domain,**Params).
+    '''
+
+    def __init__(self,Domain,Method,Options,Start,Metrics):
+        self.Domain = Domain
+        self.Method = Method
+        self.Options = Options
+        self.Start = Start
+        self.Metrics = Metrics
+
+    def Key(self):
+        return ' | '.join(
+            Entry[0]+'('+', '.join(p[0]+'='+p[1] for p in Entry[1])+')'
+            for Entry in [(self.Domain[0],self.Domain[2]),
+                          (self.Method[0],self.Method[2]),
+                          (self.Options[0],self.Options[2])])
+
+    def Columns(self):
+        Row = {'Key': self.Key(), 'Domain': self.Domain[0],
+               'Method': self.Method[0], 'Options': self.Options[0]}
+        for Part, Entry in [('Domain',self.Domain),('Method',self.Method),
+                            ('Options',self.Options)]:
+            for name, label, value in Entry[2]:
+                Row[Part+'.'+name] = value if IsNumber(value) else label
+        return Row
+
+    def Run(self):
+        Kwargs = lambda Entry: dict((p[0],p[2]) for p in Entry[2])
+        Domain = self.Domain[1](**Kwargs(self.Domain))
+        Method = self.Method[1](Domain=Domain,**Kwargs(self.Method))
+        Options = self.Options[1](Domain,**Kwargs(self.Options))
+        Start = self.Start(Domain)
+
+        tic = time.time()
+        Record = Solve(Start,Method,Domain,Options)
+        toc = time.time() - tic
+
+        # Final metrics
+        Row = {'Time': toc, 'Iterations': Record.thisPermIndex,
+               'TerminatedBy': Name(Record.TerminatedBy)}
+        for counter in ['F Evaluations','Jac Evaluations','Projections',
+                        'Rejected Steps']:
+            if counter in Record.TempStorage:
+                Row[counter] = Record.TempStorage[counter][-1]
+        for tol in Options.Term.Tols[1]:
+            Row[Name(tol[0])] = Current(Record,tol[0])
+        for name, metric in self.Metrics.items():
+            Row[name] = metric(Record,Domain)
+        return Row
+
+
+def IsNumber(Value):
+    return isinstance(Value,(Number,np.number)) and \
+        not isinstance(Value,complex)
+
+
+def Work(Task,Conn):
+    try:
+        Row = Task.Run()
+        Row['Status'] = 'ok'
+    except Exception:
+        Row = {'Status': 'error', 'Error': traceback.format_exc(limit=1)}
+    Conn.send(Row)
+    Conn.close()
+
+
+def LoadTable(Path):
+    '''Reads a sweep's results table as a dict of equal-length columns.'''
+    if not os.path.exists(Path):
+        return {}
+    with np.load(Path) as Table:
+        return dict((col,Table[col]) for col in Table.files)
+
+
+def SaveTable(Rows,Path):
+    Columns = sorted(set(col for Row in Rows for col in Row))
+    Table = {}
+    for col in Columns:
+        Values = [Row.get(col) for Row in Rows]
+        if all(v is None or IsNumber(v) for v in Values):
+            Table[col] = np.array([np.nan if v is None else v
+                                   for v in Values],dtype=float)
+        else:
+            Table[col] = np.array(['' if v is None else str(v)
+                                   for v in Values])
+    Directory = os.path.dirname(os.path.abspath(Path))
+    fd, Temp = tempfile.mkstemp(suffix='.npz',dir=Directory)
+    os.close(fd)
+    np.savez(Temp,**Table)
+    os.rename(Temp,Path)
+
+
+def Rows(Table):
+    Size = len(Table['Key']) if 'Key' in Table else 0
+    Result = []
+    for i in range(Size):
+        Row = {}
+        for col in Table:
+            value = Table[col][i]
+            if Table[col].dtype.kind == 'f':
+                if not np.isnan(value):
+                    Row[col] = float(value)
+            elif value != '':
+                Row[col] = str(value)
+        Result.append(Row)
+    return Result
+
+
+def Sweep(Domains,Methods,Options,Path,Start=None,Metrics={},Nodes=None,
+          Timeout=None,Verbose=True):
+    '''Solves every Domains x Methods x Options configuration in parallel.
+
+    Domains, Methods and Options are lists of (Name,Factory,Params) entries
+    where Params maps parameter names to the values to sweep (see Grid and
+    Task). Start(Domain) gives the starting point (zeros by default) and
+    Metrics maps column names to functions of (Record,Domain) computed at
+    the end of each run, next to the iteration count, the evaluation
+    counters, the final values of the termination criteria and the time.
+
+    Each configuration runs in its own process, at most Nodes at a time,
+    and is killed after Timeout seconds. Results are written to the .npz
+    columnar table at Path after every run (one row per configuration with
+    Status 'ok', 'error' or 'timeout'); configurations already solved
+    successfully in that table are skipped, so an interrupted sweep picks up
+    where it stopped. Processes are forked, so factories may be lambdas.
+    Returns the table as read by LoadTable.
+    '''
+    if Start is None:
+        Start = lambda Domain: np.zeros(Domain.Dim)
+    if Nodes is None:
+        Nodes = mp.cpu_count()
+
+    # Skip configurations with results
+    Table = Rows(LoadTable(Path))
+    Done = set(Row['Key'] for Row in Table if Row.get('Status') == 'ok')
+    Table = [Row for Row in Table if Row['Key'] in Done]
+
+    Pending = []
+    for D, M, O in itertools.product(Domains,Methods,Options):
+        for DP, MP, OP in itertools.product(Grid(D[2]),Grid(M[2]),
+                                            Grid(O[2])):
+            task = Task((D[0],D[1],DP),(M[0],M[1],MP),(O[0],O[1],OP),
+                        Start,Metrics)
+            if task.Key() not in Done:
+                Pending.append(task)
+    Pending.reverse()
+
+    Running = []
+    while Pending or Running:
+
+        # Launch Tasks
+        while Pending and len(Running) < Nodes:
+            task = Pending.pop()
+            Recv, Send = mp.Pipe(duplex=False)
+            Proc = mp.Process(target=Work,args=(task,Send))
+            Proc.start()
+            Send.close()
+            Running.append((task,Proc,Recv,time.time()))
+
+        # Collect Finished and Timed Out Tasks
+        Finished = []
+        for Entry in Running:
+            task, Proc, Recv, tic = Entry
+            Row = None
+            # Liveness is checked first: a worker that exited after sending
+            # its row still has it waiting in the pipe
+            Alive = Proc.is_alive()
+            if Recv.poll() or not Alive:
+                try:
+                    Row = Recv.recv()
+                except EOFError:
+                    Row = {'Status': 'error', 'Error': 'worker died'}
+            elif Timeout is not None and time.time()-tic > Timeout:
+                Proc.terminate()
+                Row = {'Status': 'timeout', 'Time': time.time()-tic}
+            if Row is not None:
+                Proc.join()
+                Recv.close()
+                Row.update(task.Columns())
+                Table.append(Row)
+                Finished.append(Entry)
+                if Verbose:
+                    print(Row['Status'],task.Key())
+        if Finished:
+            Running = [Entry for Entry in Running if Entry not in Finished]
+            SaveTable(Table,Path)
+        else:
+            time.sleep(0.01)
+
+    return LoadTable(Path)
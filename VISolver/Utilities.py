@@ -6,8 +6,13 @@ import numpy as np
 def MachineLimit_Exp(Var, Const, L=-700., H=700.):
     Var_mn = np.abs(Var)
     Var_mx = np.abs(Var)
-    Const_mn = np.min(np.sign(Var)*Const)
-    Const_mx = np.max(np.sign(Var)*Const)
+    # Extremes of sign(Var)*Const without forming the product
+    if np.sign(Var) < 0:
+        Const_mn = -np.max(Const)
+        Const_mx = -np.min(Const)
+    else:
+        Const_mn = np.sign(Var)*np.min(Const)
+        Const_mx = np.sign(Var)*np.max(Const)
     if np.abs(Var)*Const_mn < L:
         Var_mn = np.abs(L/Const_mn)
     if np.abs(Var)*Const_mx > H:
@@ -16,14 +21,13 @@ def MachineLimit_Exp(Var, Const, L=-700., H=700.):
 
 
 def GramSchmidt(A,normalize=True):
+    # Orthogonalizes the columns of A (dim x k, k <= dim) in order
     U = A.copy()
-    for i in xrange(A.shape[0]):
+    for i in xrange(1,A.shape[1]):
         vi = A[:,i]
-        proj = 0*vi
-        for j in xrange(i):
-            uj = U[:,j]
-            proj += np.dot(vi,uj)/np.dot(uj,uj)*uj
-        U[:,i] = vi - proj
+        Ui = U[:,:i]
+        coeffs = np.dot(vi,Ui)/np.einsum('ij,ij->j',Ui,Ui)
+        U[:,i] = vi - np.dot(Ui,coeffs)
 
     if normalize:
         return U/np.linalg.norm(U,axis=0)
@@ -0,0 +1,128 @@
+import os
+import shutil
+import tempfile
+import unittest
+
+import numpy as np
+
+from VISolver.Domains.Rosenbrock import Rosenbrock
+from VISolver.Domains.Watson import Watson
+from VISolver.Solvers.Anderson import Anderson
+from VISolver.Solvers.HeunEuler import HeunEuler
+from VISolver.Solvers.RosenbrockW import RosenbrockW
+
+from VISolver.Projection import EuclideanSimplexProjection
+from VISolver.Solver import Solve
+from VISolver.Options import (
+    DescentOptions, Miscellaneous, Reporting, Termination, Initialization,
+    StepPinned)
+
+
+def Run(Method,Domain,Start,MaxIter,Step=-1e-3,Checkpoint=None,Every=1000,
+        resume=None,Stalls=[]):
+    Init = Initialization(Step=Step)
+    Term = Termination(MaxIter=MaxIter,Stalls=Stalls)
+    Repo = Reporting(Requests=['Data','F Evaluations'])
+    Misc = Miscellaneous(Checkpoint=Checkpoint,CheckpointEvery=Every)
+    Options = DescentOptions(Init,Term,Repo,Misc)
+    return Solve(Start,Method,Domain,Options,resume=resume)
+
+
+class ResumeTest(unittest.TestCase):
+    # A run checkpointed at Split and resumed must match a run that was
+    # never interrupted, iterate for iterate
+
+    Split = 23
+
+    MaxIter = 80
+
+    def setUp(self):
+        self.Directory = tempfile.mkdtemp()
+        self.Path = os.path.join(self.Directory,'run.pkl')
+
+    def tearDown(self):
+        shutil.rmtree(self.Directory)
+
+    def assertResumes(self,MakeMethod,Domain,Start,Step=-1e-3,Stalls=()):
+        Whole = Run(MakeMethod(),Domain,Start,self.MaxIter,Step=Step,
+                    Stalls=[Stall() for Stall in Stalls])
+        Run(MakeMethod(),Domain,Start,self.Split,Step=Step,
+            Checkpoint=self.Path,Every=self.Split,
+            Stalls=[Stall() for Stall in Stalls])
+        Resumed = Run(MakeMethod(),Domain,Start,self.MaxIter,Step=Step,
+                      resume=self.Path,Stalls=[Stall() for Stall in Stalls])
+        self.assertEqual(Resumed.thisPermIndex,Whole.thisPermIndex)
+        self.assertEqual(Resumed.TerminatedBy,Whole.TerminatedBy)
+        for req in ['Data','F Evaluations']:
+            np.testing.assert_array_equal(np.asarray(Resumed.PermStorage[req]),
+                                          np.asarray(Whole.PermStorage[req]))
+        return Whole
+
+    def test_HeunEuler(self):
+        Domain = Rosenbrock(Dim=10)
+        self.assertResumes(lambda: HeunEuler(Domain,Delta0=1e-4),Domain,
+                           -np.ones(Domain.Dim))
+
+    def test_CacheF(self):
+        # Cached mappings are keyed by the name of the mapping they wrap
+        Domain = Rosenbrock(Dim=10)
+        Domain.CacheF()
+        self.assertResumes(lambda: HeunEuler(Domain,Delta0=1e-4),Domain,
+                           -np.ones(Domain.Dim))
+
+    def test_Anderson(self):
+        # The difference memory is carried across the split
+        Domain = Watson(Pos=0)
+        P = EuclideanSimplexProjection()
+        self.assertResumes(lambda: Anderson(Domain,P=P),Domain,
+                           np.ones(Domain.Dim)/Domain.Dim,Step=-1e-1)
+
+    def test_RosenbrockW(self):
+        # The Jacobian and LU factorization are reused across the split
+        Domain = Rosenbrock(Dim=10)
+        self.assertResumes(lambda: RosenbrockW(Domain),Domain,
+                           -np.ones(Domain.Dim))
+
+    def test_Stalls(self):
+        # The step is pinned early on, so the run stops at the same iteration
+        # only if the count survives the checkpoint
+        Domain = Rosenbrock(Dim=10)
+        Whole = self.assertResumes(lambda: HeunEuler(Domain,MinStep=-1e-3),
+                                   Domain,-np.ones(Domain.Dim),
+                                   Stalls=[lambda: StepPinned(Count=40)])
+        self.assertEqual(Whole.TerminatedBy,'StepPinned')
+        self.assertLess(Whole.thisPermIndex,self.Split+40)
+
+    def test_SolverState(self):
+        # State returned by the solver's hook is restored on resume
+        Domain = Rosenbrock(Dim=2)
+        Method = Stateful(Domain)
+        Run(Method,Domain,np.zeros(2),self.Split,Checkpoint=self.Path,
+            Every=self.Split)
+        Method = Stateful(Domain)
+        Run(Method,Domain,np.zeros(2),self.Split,resume=self.Path)
+        self.assertEqual(Method.Restored,{'Updates': self.Split})
+
+
+class Stateful(HeunEuler):
+    # Counts its updates outside TempStorage
+
+    def InitTempStorage(self,Start,Domain,Options):
+        self.Updates = 0
+        self.Restored = None
+        return super(Stateful,self).InitTempStorage(Start,Domain,Options)
+
+    def Update(self,Record):
+        self.Updates += 1
+        return super(Stateful,self).Update(Record)
+
+    def State(self):
+        return {'Updates': self.Updates}
+
+    def Restore(self,State):
+        self.Restored = State
+        self.Updates = State['Updates']
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,55 @@
+import unittest
+
+import numpy as np
+
+from VISolver.Domain import Domain
+from VISolver.Solvers.Euler_LEGS import Euler_LEGS
+
+from VISolver.Solver import Solve
+from VISolver.Options import (
+    DescentOptions, Miscellaneous, Reporting, Termination, Initialization)
+
+
+class Coupled(Domain):
+    # F(x) = A*x + sin(x) for a fixed random A, with its Jacobian
+
+    def __init__(self,Dim=5):
+        self.Dim = Dim
+        self.A = np.random.RandomState(0).randn(Dim,Dim)/Dim
+
+    def F(self,Data):
+        return np.dot(self.A,Data) + np.sin(Data)
+
+    def Jac(self,Data):
+        return self.A + np.diag(np.cos(Data))
+
+
+class ModesTest(unittest.TestCase):
+
+    def Run(self,Modes):
+        D = Coupled()
+        Method = Euler_LEGS(D,FixStep=True,Modes=Modes)
+        Init = Initialization(Step=1e-2)
+        Term = Termination(MaxIter=200)
+        Options = DescentOptions(Init,Term,Reporting(),Miscellaneous())
+        return Solve(np.linspace(-1,1,D.Dim),Method,D,Options)
+
+    def test_LeadingModes(self):
+        # Tracking k modes reproduces the first k columns and exponents of
+        # a run tracking all of them
+        Full = self.Run(None)
+        for k in [1,2,4]:
+            Part = self.Run(k)
+            np.testing.assert_allclose(Part.TempStorage['Data'][-1],
+                                       Full.TempStorage['Data'][-1])
+            np.testing.assert_allclose(Part.TempStorage['Lyapunov'][-1],
+                                       Full.TempStorage['Lyapunov'][-1][:k],
+                                       rtol=1e-10)
+            Psi = Full.TempStorage['Psi'][-1].reshape(5,-1)
+            np.testing.assert_allclose(
+                Part.TempStorage['Psi'][-1].reshape(5,-1),Psi[:,:k],
+                rtol=1e-10,atol=1e-12)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,94 @@
+import unittest
+
+import numpy as np
+
+from VISolver.Domain import Domain
+from VISolver.Solvers.RungeKutta import RungeKutta, DP54, BS32, CK45, HE21
+from VISolver.StepControl import PIControl
+from VISolver.Projection import BoxProjection
+
+from VISolver.Solver import Solve
+from VISolver.Options import (
+    DescentOptions, Miscellaneous, Reporting, Termination, Initialization)
+
+
+class Bounded(Domain):
+    # F(x) = x inside |x| < 5 and nan outside, so too long steps diverge
+
+    def __init__(self,Dim=2):
+        self.Dim = Dim
+
+    def F(self,Data):
+        if np.max(np.abs(Data)) >= 5:
+            return np.nan*Data
+        return np.array(Data,dtype=float)
+
+
+class RetryTest(unittest.TestCase):
+
+    def Run(self,Tableau):
+        D = Bounded()
+        Method = RungeKutta(D,Tableau=Tableau,Control=PIControl(Abs=1e-3))
+        Init = Initialization(Step=-100.)
+        Term = Termination(MaxIter=200)
+        Repo = Reporting(Requests=['Rejected Steps'])
+        Options = DescentOptions(Init,Term,Repo,Miscellaneous())
+        return Solve(np.ones(D.Dim),Method,D,Options)
+
+    def assertRecovers(self,Tableau):
+        # Updates rejected for diverging are retried with smaller steps
+        # until they stay finite
+        Record = self.Run(Tableau)
+        Data = Record.TempStorage['Data'][-1]
+        self.assertTrue(np.all(np.isfinite(Data)))
+        self.assertLess(np.max(np.abs(Data)),1e-3)
+        self.assertLess(Record.TempStorage['Rejected Steps'][-1],
+                        Record.thisPermIndex)
+
+    def test_DP54(self):
+        self.assertRecovers(DP54)
+
+    def test_BS32(self):
+        self.assertRecovers(BS32)
+
+
+class Counted(BoxProjection):
+    # Counts the projections performed
+
+    Count = 0
+
+    def P(self,Data,Step=0.,Direc=0.,out=None):
+        self.Count += 1
+        return super(Counted,self).P(Data,Step,Direc,out=out)
+
+
+class ProjectionsTest(unittest.TestCase):
+
+    def assertCounts(self,Tableau,PerUpdate):
+        # The Projections counter matches the projections performed
+        D = Bounded()
+        P = Counted(lo=-1)
+        Method = RungeKutta(D,P=P,Tableau=Tableau,
+                            Control=PIControl(Abs=1e-3))
+        Init = Initialization(Step=-100.)
+        Term = Termination(MaxIter=50)
+        Options = DescentOptions(Init,Term,Reporting(),Miscellaneous())
+        Record = Solve(np.ones(D.Dim),Method,D,Options)
+        Updates = Record.thisPermIndex + \
+            Record.TempStorage['Rejected Steps'][-1]
+        self.assertEqual(Record.TempStorage['Projections'][-1],P.Count)
+        self.assertEqual(P.Count,PerUpdate*Updates)
+
+    def test_HE21(self):
+        # The embedded Euler step is the point of the second stage
+        self.assertCounts(HE21,2)
+
+    def test_BS32(self):
+        self.assertCounts(BS32,4)
+
+    def test_CK45(self):
+        self.assertCounts(CK45,7)
+
+
+if __name__ == '__main__':
+    unittest.main()